@@ -1,9 +1,10 @@
 import streamlit as st
-import pandas as pd
 import os
-import base64
 import datetime
 
+from mis_assets import asset_url, image_html
+from mis_storage import append_row, create_table, open_export, read_table, recover_tables
+
 # ----------------- Constants -----------------
 DAILY_TASK_CSV = 'content_team_daily_tasks.csv'
 TRAINING_CSV = 'content_team_training_tracker.csv'
@@ -24,31 +25,38 @@ MIS_COLUMNS = [
 
 # ----------------- Helper Functions -----------------
 def create_csv(file, columns):
-    if not os.path.exists(file):
-        pd.DataFrame(columns=columns).to_csv(file, index=False)
+    create_table(file, columns)
 
 def insert_data(file, data):
-    df = fetch_data(file, list(data.keys()))
-    data["S.No"] = len(df) + 1
-    df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
-    df.to_csv(file, index=False)
+    append_row(file, data)
 
 def fetch_data(file, columns):
-    return pd.read_csv(file) if os.path.isfile(file) else pd.DataFrame(columns=columns)
-
-def download_csv(df, filename):
-    if not df.empty:
-        csv = df.to_csv(index=False).encode()
-        st.download_button("📥 Download CSV", csv, filename, "text/csv")
+    return read_table(file, columns)
+
+def download_csv(file, filename):
+    # The export is only built after "Prepare export" is clicked, not on every rerun.
+    if read_table(file, []).empty:
+        return
+    key = os.path.splitext(os.path.basename(file))[0]
+    if st.button("📦 Prepare export", key=f"{key}_export"):
+        st.session_state[f"{key}_export_ready"] = True
+    if st.session_state.get(f"{key}_export_ready"):
+        with open_export(file, "csv") as export:
+            if st.download_button("📥 Download CSV", export, filename, "text/csv", key=f"{key}_download"):
+                del st.session_state[f"{key}_export_ready"]
+
+def lazy_tabs(labels, key):
+    # Stand-in for st.tabs, which runs every tab's body (reading and rendering every
+    # table) on each rerun. The selected tab is kept in session state under key and
+    # only its body runs.
+    return st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
 
 def set_background_image(image_file_path):
     if os.path.exists(image_file_path):
-        with open(image_file_path, "rb") as image_file:
-            encoded = base64.b64encode(image_file.read()).decode()
         css = f"""
         <style>
         .stApp {{
-            background-image: url("data:image/jpg;base64,{encoded}");
+            background-image: url("{asset_url(image_file_path)}");
             background-size: cover;
             background-repeat: no-repeat;
             background-position: center;
@@ -65,7 +73,7 @@ def login_screen():
         st.markdown("<h2 style='margin-bottom: 0;'>CONTENT MIS PROJECT</h2>", unsafe_allow_html=True)
     with col2:
         if os.path.exists("NEW LOGO - OMOTEC.png"):
-            st.image("NEW LOGO - OMOTEC.png", use_column_width=True)
+            st.markdown(image_html("NEW LOGO - OMOTEC.png"), unsafe_allow_html=True)
 
     st.markdown("📚 STUDENT ASSESSMENT LOGIN")
     username = st.text_input("Username")
@@ -104,7 +112,7 @@ def Daily_Task_Logger_Page():
     df = fetch_data(DAILY_TASK_CSV, DAILY_TASK_COLUMNS)
     st.markdown("### 🗂️ Records")
     st.dataframe(df, use_container_width=True)
-    download_csv(df, "daily_tasks.csv")
+    download_csv(DAILY_TASK_CSV, "daily_tasks.csv")
 
 def Training_Tracker_Page():
     st.header("📚 Training Tracker")
@@ -130,7 +138,7 @@ def Training_Tracker_Page():
     df = fetch_data(TRAINING_CSV, TRAINING_COLUMNS)
     st.markdown("### 📈 Records")
     st.dataframe(df, use_container_width=True)
-    download_csv(df, "training_tracker.csv")
+    download_csv(TRAINING_CSV, "training_tracker.csv")
 
 def Audit_Error_Logs_Page():
     st.header("📋 Audit & Error Logs")
@@ -157,15 +165,16 @@ def Audit_Error_Logs_Page():
     df = fetch_data(AUDIT_CSV, AUDIT_COLUMNS)
     st.markdown("### 🔍 Audit Records")
     st.dataframe(df, use_container_width=True)
-    download_csv(df, "audit_logs.csv")
+    download_csv(AUDIT_CSV, "audit_logs.csv")
 
 
 
 def Content_Audit_Tracker_Page():
-    tabs = st.tabs(["📌 Primary Audit Tracker", "📆 Audit Calendar", "📝 Feedback Summary"])
+    tabs = ["📌 Primary Audit Tracker", "📆 Audit Calendar", "📝 Feedback Summary"]
+    tab = lazy_tabs(tabs, "audit_tracker_tab")
 
     # ---------- Section i: Primary Content Audit Tracker ----------
-    with tabs[0]:
+    if tab == tabs[0]:
         st.subheader("📌 Primary Content Audit Tracker")
         csv_path = 'primary_content_audit.csv'
         columns = [
@@ -206,10 +215,10 @@ def Content_Audit_Tracker_Page():
 
         df = fetch_data(csv_path, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "primary_audit_tracker.csv")
+        download_csv(csv_path, "primary_audit_tracker.csv")
 
     # ---------- Section ii: Audit Calendar ----------
-    with tabs[1]:
+    if tab == tabs[1]:
         st.subheader("📆 Monthly Audit Calendar")
         csv_path = 'audit_calendar.csv'
         columns = ["S.No", "Month", "Courses for Audit", "Auditor", "Deadline", "Review Meeting Date", "Comments"]
@@ -235,10 +244,10 @@ def Content_Audit_Tracker_Page():
 
         df = fetch_data(csv_path, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "audit_calendar.csv")
+        download_csv(csv_path, "audit_calendar.csv")
 
     # ---------- Section iii: Feedback Summary ----------
-    with tabs[2]:
+    if tab == tabs[2]:
         st.subheader("📝 Feedback Summary Page")
         csv_path = 'feedback_summary.csv'
         columns = ["S.No", "Course Name", "Source", "Rating", "Issue Reported", "Suggestions", "Date Received"]
@@ -264,18 +273,19 @@ def Content_Audit_Tracker_Page():
 
         df = fetch_data(csv_path, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "feedback_summary.csv")
+        download_csv(csv_path, "feedback_summary.csv")
 
 
 def Content_QC_Page():
     st.sidebar.title("📂 Navigation")
     st.header("📑 Content QC Page")
-    tabs = st.tabs(["🧪 Main Content QC", "📚 Textbook QC", "📄 Worksheet QC"])
+    tabs = ["🧪 Main Content QC", "📚 Textbook QC", "📄 Worksheet QC"]
+    tab = lazy_tabs(tabs, "content_qc_tab")
     st.sidebar.markdown("---")
     st.sidebar.markdown("Navigate to other pages from the sidebar")
 
     # ---------- i) MAIN CONTENT QC PAGE ----------
-    with tabs[0]:
+    if tab == tabs[0]:
         st.subheader("🧪 Main Content QC")
         file = "main_content_qc.csv"
         columns = [
@@ -331,10 +341,10 @@ def Content_QC_Page():
 
         df = fetch_data(file, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "main_content_qc.csv")
+        download_csv(file, "main_content_qc.csv")
 
     # ---------- ii) TEXTBOOK QC PAGE ----------
-    with tabs[1]:
+    if tab == tabs[1]:
         st.subheader("📚 Textbook QC")
         file = "textbook_qc.csv"
         columns = [
@@ -383,10 +393,10 @@ def Content_QC_Page():
 
         df = fetch_data(file, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "textbook_qc.csv")
+        download_csv(file, "textbook_qc.csv")
 
     # ---------- iii) WORKSHEET QC PAGE ----------
-    with tabs[2]:
+    if tab == tabs[2]:
         st.subheader("📄 Worksheet QC")
         file = "worksheet_qc.csv"
         columns = [
@@ -440,7 +450,7 @@ def Content_QC_Page():
 
         df = fetch_data(file, columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "worksheet_qc.csv")
+        download_csv(file, "worksheet_qc.csv")
 
 
 def sidebar_navigation():
@@ -458,10 +468,11 @@ def sidebar_navigation():
 
 def Mis_KPIs_Page():
     st.header("📊 MIS & KPIs Overview")
-    tabs = st.tabs(["📁 MIS Template Page", "📌 KPIs Page", "👥 Content Team KPI Page"])
+    tabs = ["📁 MIS Template Page", "📌 KPIs Page", "👥 Content Team KPI Page"]
+    tab = lazy_tabs(tabs, "mis_kpis_tab")
 
     # --- i) MIS TEMPLATE PAGE ---
-    with tabs[0]:
+    if tab == tabs[0]:
         st.subheader("📁 MIS Template")
         mis_file = "mis_template.csv"
         mis_columns = [
@@ -501,10 +512,10 @@ def Mis_KPIs_Page():
 
         df = fetch_data(mis_file, mis_columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "mis_template.csv")
+        download_csv(mis_file, "mis_template.csv")
 
     # --- ii) KPIs PAGE ---
-    with tabs[1]:
+    if tab == tabs[1]:
         st.subheader("📌 KPI Tracker")
         kpi_file = "kpi_page.csv"
         kpi_columns = ["S.No", "KPI", "Target", "Owner"]
@@ -534,10 +545,10 @@ def Mis_KPIs_Page():
 
         df = fetch_data(kpi_file, kpi_columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "kpi_page.csv")
+        download_csv(kpi_file, "kpi_page.csv")
 
     # --- iii) CONTENT TEAM KPI PAGE ---
-    with tabs[2]:
+    if tab == tabs[2]:
         st.subheader("👥 Content Team KPI Overview")
         kpi_team_file = "content_team_kpis.csv"
         kpi_team_columns = ["S.No", "Content Creation", "Content Quality & Improvement", "Quality & Accuracy"]
@@ -572,7 +583,7 @@ def Mis_KPIs_Page():
 
         df = fetch_data(kpi_team_file, kpi_team_columns)
         st.dataframe(df, use_container_width=True)
-        download_csv(df, "content_team_kpis.csv")
+        download_csv(kpi_team_file, "content_team_kpis.csv")
 
 # ----------------- App Config -----------------
 st.set_page_config(page_title="Content Team Dashboard", layout="wide")
@@ -580,6 +591,9 @@ st.set_page_config(page_title="Content Team Dashboard", layout="wide")
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 
+# Repairs tables left half-written by a crash; a no-op after the first run.
+recover_tables()
+
 if not st.session_state.logged_in:
     login_screen()
 else:
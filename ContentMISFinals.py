@@ -1,10 +1,23 @@
 import streamlit as st
 import pandas as pd
 import os
-import base64
 import datetime
+import time
 import streamlit.components.v1 as components
 
+from mis_assets import asset_url, image_html
+from mis_indexes import search
+from mis_kpis import course_kpis, member_kpis, monthly_kpis, turnaround_stats
+from mis_metrics import counter, start_metrics_server
+from mis_profiling import profile_call, timed, timing_stats
+from mis_schema import (
+    date_columns, filter_columns, form_fields, table_columns, table_schema, table_spec, validate_rows
+)
+from mis_storage import (
+    EXPORT_MIME_TYPES, append_row, append_rows, count_rows, create_table, delete_row, export_formats,
+    filter_values, migrate_tables, open_export, read_page, recover_tables
+)
+
 # ----------------- Constants -----------------
 DAILY_TASK_CSV = 'content_team_daily_tasks.csv'
 TRAINING_CSV = 'content_team_training_tracker.csv'
@@ -14,49 +27,260 @@ MIS_CSV = 'content_team_mis_kpis.csv'
 USERNAME = "omotec"
 PASSWORD = "omotec"
 
-DAILY_TASK_COLUMNS = ["S.No", "Date", "Team Member", "Task Description", "Time Spent (Hrs)", "Status"]
-TRAINING_COLUMNS = ["S.No", "Date", "Team Member", "Training Name", "Duration (Hrs)", "Feedback"]
-AUDIT_COLUMNS = ["S.No", "Date", "Team Member", "Document/Task", "Error Type", "Correction Action", "Remarks"]
-MIS_COLUMNS = [
-    "S.No", "Month", "Curriculum Modules Built", "Modules Revised", "Quality Checks Done",
-    "Average QC Score (%)", "Turnaround Time (Days)", "Content Feedback Items",
-    "Content Updated Based on Feedback", "Pending Requests", "Notes/Challenges"
-]
+RERUNS = counter("mis_reruns_total", "Script reruns by page", ("page",))
+APP_ERRORS = counter("mis_app_errors_total", "Errors reported to users, by exception type or \"validation\"", ("kind",))
+
+AUDIT_TRACKER_TABS = {
+    "📌 Primary Audit Tracker": "primary_content_audit.csv",
+    "📆 Audit Calendar": "audit_calendar.csv",
+    "📝 Feedback Summary": "feedback_summary.csv",
+}
+QC_TABS = {
+    "📄 Main Content QC": "lesson_plan_qc.csv",
+    "📖 Textbook QC": "textbook_qc.csv",
+    "📝 Worksheet QC": "worksheet_qc.csv",
+}
+
+IMPORT_TABLES = {
+    "📅 Daily Tasks": DAILY_TASK_CSV,
+    "📚 Training Tracker": TRAINING_CSV,
+    "🧾 Audit & Error Logs": AUDIT_CSV,
+    "📄 Main Content QC (Lesson Plan)": "lesson_plan_qc.csv",
+    "📖 Textbook QC": "textbook_qc.csv",
+    "📝 Worksheet QC": "worksheet_qc.csv",
+}
 
 # ----------------- Helper Functions -----------------
+def report_error(error):
+    # Every error shown to the user goes through here so the metrics endpoint can
+    # count them: by exception type, or as "validation" for messages about the input.
+    st.session_state.error_message = str(error)
+    APP_ERRORS.inc(kind=type(error).__name__ if isinstance(error, Exception) else "validation")
+
+@timed("create_csv")
 def create_csv(file, columns):
-    if not os.path.exists(file):
-        pd.DataFrame(columns=columns).to_csv(file, index=False)
+    create_table(file, columns)
 
+@timed("insert_data")
 def insert_data(file, data):
     try:
-        df = fetch_data(file, list(data.keys()))
-        data["S.No"] = len(df) + 1
-        df = pd.concat([df, pd.DataFrame([data])], ignore_index=True)
-        df.to_csv(file, index=False)
+        append_row(file, data)
     except Exception as e:
-        st.session_state.error_message = str(e)
+        report_error(e)
 
-def fetch_data(file, columns):
+@timed("delete_data")
+def delete_data(file, s_no):
     try:
-        return pd.read_csv(file) if os.path.isfile(file) else pd.DataFrame(columns=columns)
+        delete_row(file, s_no)
+        return True
     except Exception as e:
-        st.session_state.error_message = str(e)
-        return pd.DataFrame(columns=columns)
-
-def download_csv(df, filename):
-    if not df.empty:
-        csv = df.to_csv(index=False).encode()
-        st.download_button("📥 Download CSV", csv, filename, "text/csv")
-
+        report_error(e)
+        return False
+
+def lazy_tabs(labels, key):
+    # Stand-in for st.tabs, which runs every tab's body (reading and rendering every
+    # table) on each rerun. The selected tab is kept in session state under key and
+    # only its body runs.
+    return st.radio("Section", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+def delete_section(file, key):
+    st.subheader("Delete Entry")
+    s_no = st.number_input("S.No to Delete", min_value=1, step=1, key=f"{key}_s_no")
+    if st.button("Delete", key=key):
+        if delete_data(file, s_no):
+            st.success(f"✅ Entry {s_no} Deleted!")
+
+def record_filters(file, key):
+    roles = {role: column for role, column in filter_columns(file).items() if column in table_columns(file)}
+    if not roles:
+        return {}
+    filters = {}
+    with st.expander("🔍 Filter", expanded=False):
+        for cell, (role, column) in zip(st.columns(len(roles)), roles.items()):
+            if role == "date":
+                picked = cell.date_input(column, value=(), key=f"{key}_filter_{role}")
+                if len(picked) == 2:
+                    filters[column] = tuple(picked)
+                continue
+            try:
+                options = filter_values(file, column)
+            except Exception as e:
+                report_error(e)
+                options = []
+            choice = cell.selectbox(column, ["All"] + options, key=f"{key}_filter_{role}")
+            if choice != "All":
+                filters[column] = choice
+    return filters
+
+def show_records(file, columns):
+    key = os.path.splitext(os.path.basename(file))[0]
+    filters = record_filters(file, key)
+    try:
+        with timed("count_rows"):
+            total = count_rows(file, columns, filters)
+    except Exception as e:
+        report_error(e)
+        total = 0
+    c1, c2, c3, c4 = st.columns([3, 2, 2, 2])
+    sort_by = c1.selectbox("Sort by", columns, key=f"{key}_sort_by")
+    order = c2.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order")
+    page_size = c3.selectbox("Rows per page", [25, 50, 100, 250], index=1, key=f"{key}_page_size")
+    pages = max(1, -(-total // page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        # A narrower filter or bigger page size left the old page number out of range.
+        st.session_state[f"{key}_page"] = pages
+    page = c4.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+    try:
+        with timed("read_page"):
+            df = read_page(file, columns, page, page_size, sort_by, order == "Ascending", filters)
+    except Exception as e:
+        report_error(e)
+        df = pd.DataFrame(columns=columns)
+    column_config = {
+        column: st.column_config.DateColumn(format="MMM YYYY" if kind == "month" else "YYYY-MM-DD")
+        for column, kind in date_columns(file).items()
+    }
+    with timed("st.dataframe"):
+        st.dataframe(df, use_container_width=True, hide_index=True, column_config=column_config)
+    first = (page - 1) * page_size
+    st.caption(f"Showing {min(first + 1, total)}–{min(first + page_size, total)} of {total}{' matching' if filters else ''} (page {page} of {pages})")
+
+def editor_columns(file, columns):
+    # An empty, typed frame for st.data_editor and the matching column editors.
+    schema = table_schema(file)
+    frame, config = {}, {}
+    for column in columns:
+        kind = schema.get(column)
+        if kind == "date":
+            frame[column] = pd.Series(dtype="datetime64[ns]")
+            config[column] = st.column_config.DateColumn(format="YYYY-MM-DD", default=datetime.date.today())
+        elif kind in ("float", "int"):
+            frame[column] = pd.Series(dtype="float64")
+            config[column] = st.column_config.NumberColumn(min_value=0, step=1 if kind == "int" else 0.5)
+        elif isinstance(kind, list):
+            frame[column] = pd.Series(dtype="string")
+            config[column] = st.column_config.SelectboxColumn(options=kind)
+        else:
+            frame[column] = pd.Series(dtype="string")
+            config[column] = st.column_config.TextColumn()
+    return pd.DataFrame(frame), config
+
+def batch_entry(file, columns, key):
+    # Rows are staged in the grid without reruns and saved together by one
+    # append_rows call: one rerun and one write for the whole batch.
+    fields = [c for c in columns if c != "S.No"]
+    generation = st.session_state.get(f"{key}_batch_generation", 0)
+    saved = st.session_state.pop(f"{key}_batch_saved", None)
+    with st.expander("🧮 Batch Entry (several rows at once)", expanded=saved is not None):
+        if saved:
+            st.success(saved)
+        empty, config = editor_columns(file, fields)
+        with st.form(f"{key}_batch_form"):
+            rows = st.data_editor(
+                empty, num_rows="dynamic", column_config=config, hide_index=True,
+                use_container_width=True, key=f"{key}_batch_{generation}"
+            )
+            submitted = st.form_submit_button("Save All Rows")
+        if not submitted:
+            return
+        try:
+            records, errors, _ = validate_rows(rows.reset_index(drop=True), file)
+            if len(errors):
+                errors["Row"] -= 1  # grid rows, not spreadsheet rows
+                st.error(f"❌ {len(errors)} cells need fixing; nothing was saved.")
+                st.dataframe(errors, use_container_width=True, hide_index=True)
+            elif records:
+                with timed("insert_data"):
+                    s_nos = append_rows(file, records)
+                st.session_state[f"{key}_batch_saved"] = f"✅ Saved {len(s_nos)} rows (S.No {s_nos[0]}–{s_nos[-1]})"
+                st.session_state[f"{key}_batch_generation"] = generation + 1  # a fresh, empty grid
+                st.rerun()
+            else:
+                report_error("Add at least one row.")
+        except Exception as e:
+            report_error(e)
+
+def show_computed_kpis():
+    st.subheader("📈 MIS Metrics from the Logs")
+    try:
+        kpis, members, courses = monthly_kpis(), member_kpis(), course_kpis()
+    except Exception as e:
+        report_error(e)
+        return
+    if kpis.empty and members.empty and courses.empty:
+        st.info("No QC, feedback, audit or task entries yet.")
+        return
+    decimals = st.column_config.NumberColumn(format="%.1f")
+    st.dataframe(kpis, use_container_width=True, hide_index=True, column_config={
+        "Month": st.column_config.DateColumn(format="MMM YYYY"),
+        "Average QC Score (%)": decimals,
+        "Turnaround Time (Days)": decimals,
+    })
+    c1, c2 = st.columns(2)
+    c1.markdown("**👥 By Team Member**")
+    c1.dataframe(members, use_container_width=True, hide_index=True, column_config={
+        "Task Hours": decimals, "Training Hours": decimals,
+    })
+    c2.markdown("**📚 By Course**")
+    c2.dataframe(courses, use_container_width=True, hide_index=True, column_config={
+        "Turnaround Time (Days)": decimals, "Average Rating (1-5)": decimals,
+    })
+    st.caption("Computed from the QC tables, feedback summary, primary content audit and team logs.")
+
+def show_turnaround():
+    st.subheader("⏱️ QC Turnaround (Days)")
+    try:
+        stats = turnaround_stats()
+    except Exception as e:
+        report_error(e)
+        return
+    if stats["course"].empty:
+        st.info("No QC entries yet.")
+        return
+    by = st.radio("Group by", ["Course", "QC Reviewer"], horizontal=True, key="turnaround_by")
+    df = stats["course"] if by == "Course" else stats["reviewer"]
+    st.dataframe(df, use_container_width=True, hide_index=True, column_config={
+        column: st.column_config.NumberColumn(format="%.1f") for column in df.columns[2:]
+    })
+    st.caption(
+        "Across all three QC tables. QC 1: submitted → QC 1 feedback; Rework: QC 1 feedback → "
+        "content received back; QC 2: received → QC 2 feedback; Cycle: submitted → final content received."
+    )
+
+def month_turnaround(month):
+    kpis = monthly_kpis()
+    days = kpis.loc[kpis["Month"] == pd.Timestamp(month.year, month.month, 1), "Turnaround Time (Days)"]
+    return f"{days.iloc[0]:.1f}" if len(days) and pd.notna(days.iloc[0]) else ""
+
+@timed("download_csv")
+def download_csv(file, filename):
+    # The export is only serialized after "Prepare export" is clicked, not on every rerun.
+    if count_rows(file, []) == 0:
+        return
+    key = os.path.splitext(os.path.basename(file))[0]
+    c1, c2 = st.columns([1, 4])
+    fmt = c1.selectbox("Export format", export_formats(), key=f"{key}_export_format", label_visibility="collapsed")
+    if c2.button("📦 Prepare export", key=f"{key}_export"):
+        st.session_state[f"{key}_export_ready"] = fmt
+    if st.session_state.get(f"{key}_export_ready") == fmt:
+        try:
+            with open_export(file, fmt) as export:
+                clicked = st.download_button(
+                    f"📥 Download {fmt.upper()}", export, os.path.splitext(filename)[0] + "." + fmt,
+                    EXPORT_MIME_TYPES[fmt], key=f"{key}_download"
+                )
+            if clicked:
+                del st.session_state[f"{key}_export_ready"]
+        except Exception as e:
+            report_error(e)
+
+@timed("set_background_image")
 def set_background_image(image_file_path):
     if os.path.exists(image_file_path):
-        with open(image_file_path, "rb") as image_file:
-            encoded = base64.b64encode(image_file.read()).decode()
         css = f"""
         <style>
         .stApp {{
-            background-image: url("data:image/jpg;base64,{encoded}");
+            background-image: url("{asset_url(image_file_path)}");
             background-size: cover;
             background-repeat: no-repeat;
             background-position: center;
@@ -107,6 +331,69 @@ def disable_enter_key():
     </script>
     """, height=0)
 
+# ----------------- Table Pages -----------------
+# Every table page is rendered from its spec in mis_schema.TABLE_SPECS: entry form,
+# batch grid, records, export and delete.
+def form_widget(cell, file, column, widget, label):
+    key = f"{os.path.splitext(os.path.basename(file))[0]}_field_{column}"
+    if widget in ("area", "wide"):
+        return cell.text_area(label, key=key)
+    if widget in ("date", "month"):
+        return cell.date_input(label, datetime.date.today(), key=key)
+    if widget == "number":
+        return cell.number_input(label, min_value=0.0, step=0.5, key=key)
+    if widget == "select":
+        return cell.selectbox(label, table_schema(file)[column], key=key)
+    if isinstance(widget, tuple) and widget[0] == "slider":
+        low, high, default = widget[1:]
+        return cell.slider(label, low, high, default, key=key)
+    return cell.text_input(label, key=key)
+
+def entry_form(file, spec):
+    fields = form_fields(file)
+    with st.form(f"form_{os.path.splitext(os.path.basename(file))[0]}"):
+        cells = st.columns(spec.get("form_columns", 1))
+        grid = [field for field in fields if field[1] != "wide"]
+        data = {
+            column: form_widget(cells[i % len(cells)], file, column, widget, label)
+            for i, (column, widget, label) in enumerate(grid)
+        }
+        for column, widget, label in fields:
+            if widget == "wide":
+                data[column] = form_widget(st, file, column, widget, label)
+
+        if st.form_submit_button(spec.get("submit", "Submit")):
+            try:
+                records, errors, _ = validate_rows(pd.DataFrame([data]), file)
+                required = errors[errors["Error"] == "required"]
+                if len(required):
+                    report_error("Please fill " + ", ".join(required["Column"]) + ".")
+                elif len(errors):
+                    report_error("; ".join(
+                        f"{column}: {error}" for column, error in zip(errors["Column"], errors["Error"])
+                    ))
+                elif records:
+                    with timed("insert_data"):
+                        append_rows(file, records)
+                    st.success(spec.get("saved", "✅ Entry saved!"))
+            except Exception as e:
+                report_error(e)
+
+def table_section(file):
+    spec = table_spec(file)
+    key = os.path.splitext(os.path.basename(file))[0]
+    columns = table_columns(file)
+    if "title" in spec:
+        st.subheader(spec["title"])
+    create_csv(file, columns)
+    entry_form(file, spec)
+    batch_entry(file, columns, key)
+    if "records" in spec:
+        st.markdown(f"### {spec['records']}")
+    show_records(file, columns)
+    download_csv(file, spec.get("export", os.path.basename(file)))
+    delete_section(file, f"delete_{key}")
+
 # ----------------- Login -----------------
 def login_screen():
     set_background_image("back.jpg")
@@ -115,7 +402,7 @@ def login_screen():
         st.markdown("<h2 style='margin-bottom: 0;'>CONTENT MIS PROJECT</h2>", unsafe_allow_html=True)
     with col2:
         if os.path.exists("NEW LOGO - OMOTEC.png"):
-            st.image("NEW LOGO - OMOTEC.png", use_column_width=True)
+            st.markdown(image_html("NEW LOGO - OMOTEC.png"), unsafe_allow_html=True)
 
     st.markdown("📚 STUDENT ASSESSMENT LOGIN")
     username = st.text_input("Username")
@@ -124,486 +411,45 @@ def login_screen():
         if username == USERNAME and password == PASSWORD:
             st.session_state.logged_in = True
         else:
-            st.session_state.error_message = "❌ Invalid credentials"
+            report_error("❌ Invalid credentials")
 
 # ----------------- Pages -----------------
 def Daily_Task_Logger_Page():
     st.header("📅 Daily Task Logger")
-    create_csv(DAILY_TASK_CSV, DAILY_TASK_COLUMNS)
-
-    with st.form("form_daily"):
-        col1, col2 = st.columns(2)
-        with col1:
-            date = st.date_input("Date")
-            member = st.text_input("Team Member")
-        with col2:
-            hours = st.number_input("Time Spent (Hrs)", min_value=0.0, step=0.5)
-            status = st.selectbox("Status", ["Pending", "In Progress", "Completed"])
-        task = st.text_area("Task Description")
-
-        if st.form_submit_button("Submit"):
-            try:
-                if member and task:
-                    insert_data(DAILY_TASK_CSV, {
-                        "Date": date, "Team Member": member, "Task Description": task,
-                        "Time Spent (Hrs)": hours, "Status": status
-                    })
-                    st.success("✅ Task logged!")
-                else:
-                    st.session_state.error_message = "Please fill all required fields."
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    df = fetch_data(DAILY_TASK_CSV, DAILY_TASK_COLUMNS)
-    st.markdown("### 🗂️ Records")
-    st.dataframe(df, use_container_width=True)
-    download_csv(df, "daily_tasks.csv")
+    table_section(DAILY_TASK_CSV)
 
 def Training_Tracker_Page():
     st.header("📚 Training Tracker")
-    create_csv(TRAINING_CSV, TRAINING_COLUMNS)
-
-    with st.form("form_training"):
-        date = st.date_input("Date")
-        member = st.text_input("Team Member")
-        training = st.text_input("Training Name")
-        duration = st.number_input("Duration (Hrs)", min_value=0.0, step=0.5)
-        feedback = st.text_area("Feedback")
-
-        if st.form_submit_button("Submit"):
-            try:
-                if member and training:
-                    insert_data(TRAINING_CSV, {
-                        "Date": date, "Team Member": member, "Training Name": training,
-                        "Duration (Hrs)": duration, "Feedback": feedback
-                    })
-                    st.success("✅ Training record saved!")
-                else:
-                    st.session_state.error_message = "Please fill all required fields."
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    df = fetch_data(TRAINING_CSV, TRAINING_COLUMNS)
-    st.markdown("### 📈 Records")
-    st.dataframe(df, use_container_width=True)
-    download_csv(df, "training_tracker.csv")
+    table_section(TRAINING_CSV)
 
 def Audit_Error_Logs_Page():
     st.header("📋 Audit & Error Logs")
-    create_csv(AUDIT_CSV, AUDIT_COLUMNS)
-
-    with st.form("form_audit"):
-        date = st.date_input("Date")
-        member = st.text_input("Team Member")
-        document = st.text_input("Document/Task")
-        error_type = st.selectbox("Error Type", ["Formatting", "Grammar", "Content", "Incorrect Data", "Other"])
-        correction = st.text_area("Correction Action Taken")
-        remarks = st.text_area("Remarks")
-
-        if st.form_submit_button("Submit"):
-            try:
-                if member and document:
-                    insert_data(AUDIT_CSV, {
-                        "Date": date, "Team Member": member, "Document/Task": document,
-                        "Error Type": error_type, "Correction Action": correction, "Remarks": remarks
-                    })
-                    st.success("✅ Audit log saved!")
-                else:
-                    st.session_state.error_message = "Please fill all required fields."
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    df = fetch_data(AUDIT_CSV, AUDIT_COLUMNS)
-    st.markdown("### 🔍 Audit Records")
-    st.dataframe(df, use_container_width=True)
-    download_csv(df, "audit_logs.csv")
+    table_section(AUDIT_CSV)
 
 def Content_Audit_Tracker_Page():
     st.subheader("📋 Content Audit Tracker Page")
-    tabs = st.tabs(["📌 Primary Audit Tracker", "📆 Audit Calendar", "📝 Feedback Summary"])
-
-    # ---------- Section i: Primary Content Audit Tracker ----------
-    with tabs[0]:
-        st.subheader("📌 Primary Content Audit Tracker")
-        csv_path = 'primary_content_audit.csv'
-        columns = [
-            "S.No", "Course Name", "Category", "Last Updated", "Status", "Usage Analytics",
-            "QC Score (/5)", "Audit Due Date", "Action Required", "Remarks",
-            "Assigned To", "Reviewed By", "Final Decision"
-        ]
-        status_options = ["Outdated", "Active", "Archived"]
-        analytics_options = ["Low", "Medium", "Very Low"]
-        action_options = ["Revise", "Keep Active", "Archive"]
-        remark_options = ["Tools outdated", "Aligns with curriculum", "Replaced by new module"]
-
-        create_csv(csv_path, columns)
-
-        with st.form("primary_audit_form"):
-            c1, c2, c3 = st.columns(3)
-            course = c1.text_input("Course Name")
-            category = c2.text_input("Category")
-            last_updated = c3.date_input("Last Updated", datetime.date.today())
-            status = c1.selectbox("Status", status_options)
-            usage = c2.selectbox("Usage Analytics", analytics_options)
-            qc_score = c3.slider("QC Score (/5)", 1, 5, 3)
-            due_date = c1.date_input("Audit Due Date", datetime.date.today())
-            action = c2.selectbox("Action Required", action_options)
-            remarks = c3.selectbox("Remarks", remark_options)
-            assigned = c1.text_input("Assigned To")
-            reviewed = c2.text_input("Reviewed By")
-            final_decision = c3.date_input("Final Decision", datetime.date.today())
-
-            if st.form_submit_button("Submit Audit Entry"):
-                try:
-                    if course:  # Basic validation
-                        insert_data(csv_path, {
-                            "Course Name": course, "Category": category, "Last Updated": last_updated,
-                            "Status": status, "Usage Analytics": usage, "QC Score (/5)": qc_score,
-                            "Audit Due Date": due_date, "Action Required": action, "Remarks": remarks,
-                            "Assigned To": assigned, "Reviewed By": reviewed, "Final Decision": final_decision
-                        })
-                        st.success("✅ Audit Entry Added Successfully")
-                    else:
-                        st.session_state.error_message = "Please fill at least the Course Name."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(csv_path, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "primary_audit_tracker.csv")
-
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_primary_audit"):
-            try:
-                df = fetch_data(csv_path, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(csv_path, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    # ---------- Section ii: Audit Calendar ----------
-    with tabs[1]:
-        st.subheader("📆 Monthly Audit Calendar")
-        csv_path = 'audit_calendar.csv'
-        columns = [
-            "S.No", "Month", "Courses for Audit", "Assigned To", "Deadline",
-            "Progress (%)", "Status", "Notes"
-        ]
-        status_options = ["Planned", "In Progress", "Completed", "Delayed"]
-
-        create_csv(csv_path, columns)
-
-        with st.form("audit_calendar_form"):
-            c1, c2 = st.columns(2)
-            month = c1.date_input("Month")
-            courses = c2.text_area("Courses for Audit (comma-separated)")
-            assigned = c1.text_input("Assigned To")
-            deadline = c2.date_input("Deadline", datetime.date.today())
-            progress = c1.slider("Progress (%)", 0, 100, 0)
-            status = c2.selectbox("Status", status_options)
-            notes = st.text_area("Notes")
-
-            if st.form_submit_button("Submit Calendar Entry"):
-                try:
-                    if courses:
-                        insert_data(csv_path, {
-                            "Month": month.strftime("%B %Y"), "Courses for Audit": courses,
-                            "Assigned To": assigned, "Deadline": deadline,
-                            "Progress (%)": progress, "Status": status, "Notes": notes
-                        })
-                        st.success("✅ Calendar Entry Added")
-                    else:
-                        st.session_state.error_message = "Please fill at least Courses for Audit."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(csv_path, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "audit_calendar.csv")
-
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_audit_calendar"):
-            try:
-                df = fetch_data(csv_path, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(csv_path, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    # ---------- Section iii: Feedback Summary ----------
-    with tabs[2]:
-        st.subheader("📝 Feedback Summary")
-        csv_path = 'feedback_summary.csv'
-        columns = [
-            "S.No", "Course Name", "Feedback Source", "Rating (1-5)", "Key Suggestions",
-            "Action Taken", "Date Received", "Follow-up Date"
-        ]
-
-        create_csv(csv_path, columns)
-
-        with st.form("feedback_summary_form"):
-            c1, c2 = st.columns(2)
-            course = c1.text_input("Course Name")
-            source = c2.text_input("Feedback Source")
-            rating = c1.slider("Rating (1-5)", 1, 5, 3)
-            suggestions = st.text_area("Key Suggestions")
-            action = st.text_area("Action Taken")
-            received = c1.date_input("Date Received", datetime.date.today())
-            followup = c2.date_input("Follow-up Date", datetime.date.today())
-
-            if st.form_submit_button("Submit Feedback"):
-                try:
-                    if course:
-                        insert_data(csv_path, {
-                            "Course Name": course, "Feedback Source": source, "Rating (1-5)": rating,
-                            "Key Suggestions": suggestions, "Action Taken": action,
-                            "Date Received": received, "Follow-up Date": followup
-                        })
-                        st.success("✅ Feedback Added")
-                    else:
-                        st.session_state.error_message = "Please fill at least Course Name."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(csv_path, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "feedback_summary.csv")
-
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_feedback_summary"):
-            try:
-                df = fetch_data(csv_path, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(csv_path, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
+    tab = lazy_tabs(list(AUDIT_TRACKER_TABS), "audit_tracker_tab")
+    table_section(AUDIT_TRACKER_TABS[tab])
 
 def Content_QC_Page():
     st.header("📑 Content QC Page")
-    tabs = st.tabs(["📄 Main Content QC", "📖 Textbook QC", "📝 Worksheet QC"])
-
-    # ---------- Main Content QC (Lesson Plan) ----------
-    with tabs[0]:
-        st.subheader("📄 Main Content QC (Lesson Plan)")
-        file = 'lesson_plan_qc.csv'
-        columns = [
-            "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
-            "CURRICULUM ALIGNMENT", "CONCEPT CLARITY", "LANGUAGE & GRAMMAR",
-            "INNOVATION & ENGAGEMENT", "ACTIVITY & EXPERIMENT QUALITY",
-            "VISUALS & DIAGRAMS", "ASSESSMENT INTEGRATION", "FLOW OF CONTENT",
-            "QC 1 FEEDBACK DATE", "QC 1 CONTENT RECEIVED ON",
-            "QC 2 FEEDBACK DATE", "QC 2 CONTENT RECEIVED ON", "REMARKS"
-        ]
-        create_csv(file, columns)
-
-        with st.form("form_lesson_plan_qc"):
-            w1, w2, w3 = st.columns(3)
-            course = w1.text_input("COURSE NAME")
-            submitted = w2.date_input("CONTENT SUBMITTED ON")
-            version = w3.text_input("VERSION")
-            updated_date = w1.date_input("UPDATED DATE")
-            curriculum = w2.text_area("CURRICULUM ALIGNMENT")
-            concept = w3.text_area("CONCEPT CLARITY")
-            language = w1.text_area("LANGUAGE & GRAMMAR")
-            innovation = w2.text_area("INNOVATION & ENGAGEMENT")
-            activity = w3.text_area("ACTIVITY & EXPERIMENT QUALITY")
-            visuals = w1.text_area("VISUALS & DIAGRAMS")
-            assessment = w2.text_area("ASSESSMENT INTEGRATION")
-            flow = w3.text_area("FLOW OF CONTENT")
-            qc1_date = w1.date_input("QC 1 FEEDBACK DATE")
-            qc1_recv = w2.date_input("QC 1 CONTENT RECEIVED ON")
-            qc2_date = w3.date_input("QC 2 FEEDBACK DATE")
-            qc2_recv = w1.date_input("QC 2 CONTENT RECEIVED ON")
-            remarks = st.text_area("REMARKS")
-
-            if st.form_submit_button("Submit Lesson Plan QC"):
-                try:
-                    if course:
-                        insert_data(file, {
-                            "COURSE NAME": course, "CONTENT SUBMITTED ON": submitted, "VERSION": version,
-                            "UPDATED DATE": updated_date, "CURRICULUM ALIGNMENT": curriculum,
-                            "CONCEPT CLARITY": concept, "LANGUAGE & GRAMMAR": language,
-                            "INNOVATION & ENGAGEMENT": innovation, "ACTIVITY & EXPERIMENT QUALITY": activity,
-                            "VISUALS & DIAGRAMS": visuals, "ASSESSMENT INTEGRATION": assessment,
-                            "FLOW OF CONTENT": flow, "QC 1 FEEDBACK DATE": qc1_date,
-                            "QC 1 CONTENT RECEIVED ON": qc1_recv, "QC 2 FEEDBACK DATE": qc2_date,
-                            "QC 2 CONTENT RECEIVED ON": qc2_recv, "REMARKS": remarks
-                        })
-                        st.success("✅ Lesson Plan QC Entry Saved!")
-                    else:
-                        st.session_state.error_message = "Please fill at least the Course Name."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(file, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "lesson_plan_qc.csv")
-
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_lesson_plan"):
-            try:
-                df = fetch_data(file, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(file, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    # ---------- Textbook QC ----------
-    with tabs[1]:
-        st.subheader("📖 Textbook QC")
-        file = 'textbook_qc.csv'
-        columns = [
-            "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
-            "CURRICULUM ALIGNMENT", "CONCEPT ACCURACY", "LANGUAGE & GRAMMAR",
-            "STRUCTURE & ORGANIZATION", "ILLUSTRATIONS & VISUALS",
-            "EXERCISE & ASSESSMENT", "INNOVATION & ENGAGEMENT",
-            "QC 1 FEEDBACK DATE", "QC 1 CONTENT RECEIVED ON",
-            "QC 2 FEEDBACK DATE", "QC 2 CONTENT RECEIVED ON", "REMARKS"
-        ]
-        create_csv(file, columns)
-
-        with st.form("form_textbook_qc"):
-            w1, w2, w3 = st.columns(3)
-            course = w1.text_input("COURSE NAME")
-            submitted = w2.date_input("CONTENT SUBMITTED ON")
-            version = w3.text_input("VERSION")
-            updated_date = w1.date_input("UPDATED DATE")
-            curriculum = w2.text_area("CURRICULUM ALIGNMENT")
-            concept = w3.text_area("CONCEPT ACCURACY")
-            language = w1.text_area("LANGUAGE & GRAMMAR")
-            structure = w2.text_area("STRUCTURE & ORGANIZATION")
-            illustrations = w3.text_area("ILLUSTRATIONS & VISUALS")
-            exercise = w1.text_area("EXERCISE & ASSESSMENT")
-            innovation = w2.text_area("INNOVATION & ENGAGEMENT")
-            qc1_date = w3.date_input("QC 1 FEEDBACK DATE")
-            qc1_recv = w1.date_input("QC 1 CONTENT RECEIVED ON")
-            qc2_date = w2.date_input("QC 2 FEEDBACK DATE")
-            qc2_recv = w3.date_input("QC 2 CONTENT RECEIVED ON")
-            remarks = st.text_area("REMARKS")
-
-            if st.form_submit_button("Submit Textbook QC"):
-                try:
-                    if course:
-                        insert_data(file, {
-                            "COURSE NAME": course, "CONTENT SUBMITTED ON": submitted, "VERSION": version,
-                            "UPDATED DATE": updated_date, "CURRICULUM ALIGNMENT": curriculum,
-                            "CONCEPT ACCURACY": concept, "LANGUAGE & GRAMMAR": language,
-                            "STRUCTURE & ORGANIZATION": structure, "ILLUSTRATIONS & VISUALS": illustrations,
-                            "EXERCISE & ASSESSMENT": exercise, "INNOVATION & ENGAGEMENT": innovation,
-                            "QC 1 FEEDBACK DATE": qc1_date, "QC 1 CONTENT RECEIVED ON": qc1_recv,
-                            "QC 2 FEEDBACK DATE": qc2_date, "QC 2 CONTENT RECEIVED ON": qc2_recv,
-                            "REMARKS": remarks
-                        })
-                        st.success("✅ Textbook QC Entry Saved!")
-                    else:
-                        st.session_state.error_message = "Please fill at least the Course Name."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(file, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "textbook_qc.csv")
-
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_textbook"):
-            try:
-                df = fetch_data(file, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(file, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
-
-    # ---------- Worksheet QC ----------
-    with tabs[2]:
-        st.subheader("📝 Worksheet QC")
-        file = 'worksheet_qc.csv'
-        columns = [
-            "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
-            "CURRICULUM ALIGNMENT", "CONCEPT ACCURACY", "LANGUAGE",
-            "STRUCTURE OF OPTIONS", "DISTRACTOR QUALITY", "VARIETY & COVERAGE",
-            "LANGUAGE & GRAMMAR", "FORMATTING & NUMBERING", "ANSWER KEY ACCURACY",
-            "QC 1 FEEDBACK DATE", "QC 1 CONTENT RECEIVED ON",
-            "QC 2 FEEDBACK DATE", "QC 2 CONTENT RECEIVED ON", "REMARKS"
-        ]
-        create_csv(file, columns)
-
-        with st.form("form_worksheet_qc"):
-            w1, w2, w3 = st.columns(3)
-            course = w1.text_input("COURSE NAME")
-            submitted = w2.date_input("CONTENT SUBMITTED ON")
-            version = w3.text_input("VERSION")
-            updated_date = w1.date_input("UPDATED DATE")
-            curriculum = w2.text_area("CURRICULUM ALIGNMENT")
-            concept = w3.text_area("CONCEPT ACCURACY")
-            language = w1.text_area("LANGUAGE")
-            options = w2.text_area("STRUCTURE OF OPTIONS")
-            distractors = w3.text_area("DISTRACTOR QUALITY")
-            variety = w1.text_area("VARIETY & COVERAGE")
-            grammar = w2.text_area("LANGUAGE & GRAMMAR")
-            formatting = w3.text_area("FORMATTING & NUMBERING")
-            answer_key = w1.text_area("ANSWER KEY ACCURACY")
-            qc1_date = w2.date_input("QC 1 FEEDBACK DATE")
-            qc1_recv = w3.date_input("QC 1 CONTENT RECEIVED ON")
-            qc2_date = w1.date_input("QC 2 FEEDBACK DATE")
-            qc2_recv = w2.date_input("QC 2 CONTENT RECEIVED ON")
-            remarks = st.text_area("REMARKS")
-
-            if st.form_submit_button("Submit Worksheet QC"):
-                try:
-                    if course:
-                        insert_data(file, {
-                            "COURSE NAME": course, "CONTENT SUBMITTED ON": submitted, "VERSION": version,
-                            "UPDATED DATE": updated_date, "CURRICULUM ALIGNMENT": curriculum,
-                            "CONCEPT ACCURACY": concept, "LANGUAGE": language,
-                            "STRUCTURE OF OPTIONS": options, "DISTRACTOR QUALITY": distractors,
-                            "VARIETY & COVERAGE": variety, "LANGUAGE & GRAMMAR": grammar,
-                            "FORMATTING & NUMBERING": formatting, "ANSWER KEY ACCURACY": answer_key,
-                            "QC 1 FEEDBACK DATE": qc1_date, "QC 1 CONTENT RECEIVED ON": qc1_recv,
-                            "QC 2 FEEDBACK DATE": qc2_date, "QC 2 CONTENT RECEIVED ON": qc2_recv,
-                            "REMARKS": remarks
-                        })
-                        st.success("✅ Worksheet QC Entry Saved!")
-                    else:
-                        st.session_state.error_message = "Please fill at least the Course Name."
-                except Exception as e:
-                    st.session_state.error_message = str(e)
-
-        df = fetch_data(file, columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "worksheet_qc.csv")
+    tab = lazy_tabs(list(QC_TABS), "content_qc_tab")
+    table_section(QC_TABS[tab])
+    show_turnaround()
 
-        # Delete section
-        st.subheader("Delete Entry")
-        s_no = st.number_input("S.No to Delete", min_value=1, step=1)
-        if st.button("Delete", key="delete_worksheet"):
-            try:
-                df = fetch_data(file, columns)
-                df = df[df["S.No"] != s_no]
-                df["S.No"] = range(1, len(df) + 1)
-                df.to_csv(file, index=False)
-                st.success(f"✅ Entry {s_no} Deleted!")
-            except Exception as e:
-                st.session_state.error_message = str(e)
+def show_search_results(query):
+    try:
+        start = time.perf_counter()
+        hits = search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        report_error(e)
+        return
+    with st.expander(f"🔎 {len(hits)} result(s) for “{query}” ({elapsed:.0f} ms)", expanded=True):
+        if hits.empty:
+            st.write("No matching entries.")
+        else:
+            st.dataframe(hits.drop(columns="Score"), use_container_width=True, hide_index=True)
 
 def sidebar_navigation():
     tabs = {
@@ -612,25 +458,100 @@ def sidebar_navigation():
         "📑 Content QC Page": Content_QC_Page,
         "🧾 Audit & Error Logs Page": Audit_Error_Logs_Page,
         "📚 TEMPLATE Training Tracker": Training_Tracker_Page,
-        "📅 TEMPLATE Daily Task Logger": Daily_Task_Logger_Page
+        "📅 TEMPLATE Daily Task Logger": Daily_Task_Logger_Page,
+        "📥 Bulk Import": Bulk_Import_Page
     }
     selection = st.sidebar.radio("📘 Select Section", list(tabs.keys()))
-    tabs[selection]()
+    query = st.sidebar.text_input("🔎 Search all tables", key="global_search")
+    if query:
+        show_search_results(query)
+    RERUNS.inc(page=tabs[selection].__name__)
+    with timed(f"page:{selection}"):
+        tabs[selection]()
+
+def performance_panel():
+    # Rolling timings of the helpers and pages across all sessions, plus a cProfile
+    # trace of a single rerun of this session on demand.
+    with st.sidebar.expander("⏱️ Performance"):
+        stats = timing_stats()
+        if stats.empty:
+            st.write("No timings yet.")
+        else:
+            st.dataframe(stats, use_container_width=True, hide_index=True, column_config={
+                column: st.column_config.NumberColumn(format="%.1f") for column in stats.columns[2:]
+            })
+        if st.button("🧪 Profile next rerun", key="profile_next"):
+            st.session_state.profile_next_rerun = True
+            st.rerun()
+        if "profile_report" in st.session_state:
+            report, raw = st.session_state.profile_report
+            st.download_button("📥 Download .prof", raw, "rerun.prof", "application/octet-stream", key="profile_download")
+            st.code(report, language=None)
+
+def read_upload(upload):
+    # Every cell as text; validate_rows does the typing.
+    if upload.name.lower().endswith(".xlsx"):
+        return pd.read_excel(upload, dtype=str)
+    return pd.read_csv(upload, dtype=str, keep_default_na=False)
+
+def Bulk_Import_Page():
+    st.header("📥 Bulk Import")
+    label = st.selectbox("Table", list(IMPORT_TABLES), key="import_table")
+    file = IMPORT_TABLES[label]
+    columns = table_columns(file)
+    create_csv(file, columns)
+    st.caption(
+        "Expected columns: " + ", ".join(c for c in columns if c != "S.No")
+        + ". Dates as YYYY-MM-DD; S.No is assigned on import."
+    )
+    upload = st.file_uploader("CSV or Excel file", type=["csv", "xlsx"], key=f"import_{file}")
+    if upload is not None:
+        checked = (upload.file_id, file)
+        try:
+            # Validated once per upload, not again on the rerun the Import button makes.
+            if st.session_state.get("import_checked", (None,))[0] != checked:
+                st.session_state.import_checked = (checked, validate_rows(read_upload(upload), file))
+            records, errors, unknown = st.session_state.import_checked[1]
+        except Exception as e:
+            report_error(e)
+            records, errors, unknown = [], pd.DataFrame(), []
+        if unknown:
+            st.warning("Ignored columns this table does not have: " + ", ".join(unknown))
+        if len(errors) and (errors["Row"] == 1).all():
+            st.error("❌ The file has no column " + ", ".join(errors["Column"]) + "; check its header row.")
+        elif len(errors):
+            st.error(f"❌ {len(errors)} cells need fixing; their rows will be skipped.")
+            st.dataframe(errors, use_container_width=True, hide_index=True)
+        if st.session_state.get("import_done") == checked:
+            st.info("This file has been imported.")
+        elif records:
+            if st.button(f"Import {len(records)} rows", key="import_submit"):
+                try:
+                    with timed("insert_data"):
+                        s_nos = append_rows(file, records)
+                    st.session_state.import_done = checked
+                    st.success(f"✅ Imported {len(s_nos)} rows (S.No {s_nos[0]}–{s_nos[-1]})")
+                except Exception as e:
+                    report_error(e)
+        elif not len(errors):
+            st.info("No rows found in the file.")
+
+    st.markdown("### 🗂️ Records")
+    show_records(file, columns)
 
 def Mis_KPIs_Page():
     disable_enter_key()  # Prevent Enter submission
     st.header("📊 MIS & KPIs Overview")
-    tabs = st.tabs(["📁 MIS Template Page", "📌 KPIs Page", "👥 Content Team KPI Page"])
+    tabs = ["📁 MIS Template Page", "📌 KPIs Page", "👥 Content Team KPI Page"]
+    tab = lazy_tabs(tabs, "mis_kpis_tab")
 
     # --- i) MIS TEMPLATE PAGE ---
-    with tabs[0]:
+    if tab == tabs[0]:
+        show_computed_kpis()
+
         st.subheader("📁 MIS Template")
         mis_file = "mis_template.csv"
-        mis_columns = [
-            "S.No", "Month", "Curriculum Modules Built", "Modules Revised", "Quality Checks Done",
-            "Average QC Score (%)", "Turnaround Time (Days)", "Content Feedback Items",
-            "Content Updated Based on Feedback", "Pending Requests", "Notes/Challenges"
-        ]
+        mis_columns = table_columns(mis_file)
         create_csv(mis_file, mis_columns)
 
         with st.form("form_mis_template"):
@@ -640,7 +561,10 @@ def Mis_KPIs_Page():
             revised = col1.text_input("Modules Revised")
             qcs = col2.text_input("Quality Checks Done")
             avg_score = col1.text_input("Average QC Score (%)")
-            tat = col2.text_input("Turnaround Time (Days)")
+            col2.text_input(
+                "Turnaround Time (Days)", "Filled in from the QC tables", disabled=True,
+                help="Mean days from submission to QC 1 feedback for content submitted that month."
+            )
             feedback_items = col1.text_input("Content Feedback Items")
             updates = col2.text_input("Content Updated Based on Feedback")
             pending = col1.text_input("Pending Requests")
@@ -655,7 +579,7 @@ def Mis_KPIs_Page():
                             "Modules Revised": revised,
                             "Quality Checks Done": qcs,
                             "Average QC Score (%)": avg_score,
-                            "Turnaround Time (Days)": tat,
+                            "Turnaround Time (Days)": month_turnaround(month),
                             "Content Feedback Items": feedback_items,
                             "Content Updated Based on Feedback": updates,
                             "Pending Requests": pending,
@@ -663,19 +587,18 @@ def Mis_KPIs_Page():
                         })
                         st.success("✅ MIS Template Entry Saved!")
                     else:
-                        st.session_state.error_message = "Please fill at least one metric field."
+                        report_error("Please fill at least one metric field.")
                 except Exception as e:
-                    st.session_state.error_message = str(e)
+                    report_error(e)
 
-        df = fetch_data(mis_file, mis_columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "mis_template.csv")
+        show_records(mis_file, mis_columns)
+        download_csv(mis_file, "mis_template.csv")
 
     # --- ii) KPIs PAGE ---
-    with tabs[1]:
+    if tab == tabs[1]:
         st.subheader("📌 KPI Tracker")
         kpi_file = "kpi_page.csv"
-        kpi_columns = ["S.No", "KPI", "Target", "Owner"]
+        kpi_columns = table_columns(kpi_file)
 
         create_csv(kpi_file, kpi_columns)
 
@@ -701,17 +624,16 @@ def Mis_KPIs_Page():
                     insert_data(kpi_file, {"KPI": kpi, "Target": target, "Owner": owner})
                     st.success("✅ KPI Record Added")
                 except Exception as e:
-                    st.session_state.error_message = str(e)
+                    report_error(e)
 
-        df = fetch_data(kpi_file, kpi_columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "kpi_page.csv")
+        show_records(kpi_file, kpi_columns)
+        download_csv(kpi_file, "kpi_page.csv")
 
     # --- iii) CONTENT TEAM KPI PAGE ---
-    with tabs[2]:
+    if tab == tabs[2]:
         st.subheader("👥 Content Team KPI Overview")
         kpi_team_file = "content_team_kpis.csv"
-        kpi_team_columns = ["S.No", "Content Creation", "Content Quality & Improvement", "Quality & Accuracy"]
+        kpi_team_columns = table_columns(kpi_team_file)
 
         create_csv(kpi_team_file, kpi_team_columns)
 
@@ -742,11 +664,10 @@ def Mis_KPIs_Page():
                     })
                     st.success("✅ Content Team KPI Submitted")
                 except Exception as e:
-                    st.session_state.error_message = str(e)
+                    report_error(e)
 
-        df = fetch_data(kpi_team_file, kpi_team_columns)
-        st.dataframe(df, use_container_width=True)
-        download_csv(df, "content_team_kpis.csv")
+        show_records(kpi_team_file, kpi_team_columns)
+        download_csv(kpi_team_file, "content_team_kpis.csv")
 
 # ----------------- App Config and Error Handling -----------------
 st.set_page_config(page_title="Content Team Dashboard", layout="wide")
@@ -757,11 +678,25 @@ if "error_message" not in st.session_state:
     st.session_state.error_message = ""
 
 try:
+    # Repairs tables left half-written by a crash, then brings older table layouts
+    # up to the current columns; both are no-ops after the first run.
+    recover_tables()
+    migrate_tables()
+    # Serves /metrics from a background thread when MIS_METRICS_PORT is set.
+    start_metrics_server()
     if not st.session_state.logged_in:
+        RERUNS.inc(page="login_screen")
         login_screen()
+    elif st.session_state.pop("profile_next_rerun", False):
+        _, report, raw = profile_call(sidebar_navigation)
+        if report is not None:
+            st.session_state.profile_report = (report, raw)
+        performance_panel()
     else:
         sidebar_navigation()
+        performance_panel()
 except Exception as e:
+    report_error(e)
     # Sanitize the error message to remove newlines and special characters
     sanitized_error = str(e).replace('\n', ' ').replace('\r', ' ')
     st.session_state.error_message = sanitized_error
@@ -0,0 +1,213 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from generate_mis_data import generate_table
+from mis_schema import FILTERS, table_columns
+
+# ----------------- Benchmark Harness -----------------
+# Times the storage paths behind the pages (insert, delete by S.No, cold and cached
+# reads, filtered reads, export) and a full page render through Streamlit's AppTest,
+# on synthetic tables of realistic sizes. Every (size, table) pair runs in its own
+# process in a scratch directory, so each starts with cold caches and its memory is
+# returned before the next; results are written as JSON for comparing runs.
+#
+#   python bench_mis.py --sizes 1000 100000 --output bench.json
+#   MIS_STORAGE=sqlite python bench_mis.py --tables worksheet_qc.csv
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ContentMISFinals.py")
+DEFAULT_SIZES = [1000, 100000, 1000000]
+DEFAULT_TABLES = [
+    "content_team_daily_tasks.csv",
+    "lesson_plan_qc.csv",
+    "textbook_qc.csv",
+    "worksheet_qc.csv",
+    "feedback_summary.csv",
+]
+WRITE_SAMPLES = 20
+
+# Where each table is shown: sidebar page, and the lazy tab key and label if any.
+PAGES = {
+    "content_team_daily_tasks.csv": ("📅 TEMPLATE Daily Task Logger", None, None),
+    "content_team_training_tracker.csv": ("📚 TEMPLATE Training Tracker", None, None),
+    "content_team_audit_logs.csv": ("🧾 Audit & Error Logs Page", None, None),
+    "primary_content_audit.csv": ("📋 Content Audit Tracker Page", "audit_tracker_tab", "📌 Primary Audit Tracker"),
+    "audit_calendar.csv": ("📋 Content Audit Tracker Page", "audit_tracker_tab", "📆 Audit Calendar"),
+    "feedback_summary.csv": ("📋 Content Audit Tracker Page", "audit_tracker_tab", "📝 Feedback Summary"),
+    "lesson_plan_qc.csv": ("📑 Content QC Page", "content_qc_tab", "📄 Main Content QC"),
+    "textbook_qc.csv": ("📑 Content QC Page", "content_qc_tab", "📖 Textbook QC"),
+    "worksheet_qc.csv": ("📑 Content QC Page", "content_qc_tab", "📝 Worksheet QC"),
+}
+
+
+# ----------------- Synthetic Tables -----------------
+# Tables come from generate_mis_data with a fixed end date, so a seed always gives
+# the same rows and runs on different days stay comparable.
+BENCH_END = datetime.date(2025, 6, 30)
+
+
+def _write_table(file, rows, seed):
+    from mis_storage import SQLITE_PATH, atomic_write_csv, import_csvs
+    atomic_write_csv(generate_table(file, rows, seed, BENCH_END), file)
+    if os.environ.get("MIS_STORAGE") == "sqlite":
+        import_csvs(SQLITE_PATH, [file], replace=True)
+
+
+# ----------------- Timed Operations -----------------
+def _time(fn, runs=1):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _result(file, rows, op, samples):
+    ms = [1000 * s for s in samples]
+    return {
+        "table": file,
+        "rows": rows,
+        "op": op,
+        "runs": len(ms),
+        "median_ms": statistics.median(ms),
+        "min_ms": min(ms),
+        "max_ms": max(ms),
+    }
+
+
+def _filters(file, df):
+    # One member/status value and a quarter's date range, as picked in the Filter expander.
+    filters = {}
+    for role, column in FILTERS.get(file, {}).items():
+        if role == "date":
+            filters[column] = (datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))
+        elif role in ("member", "status") and len(df):
+            filters[column] = df[column].dropna().iloc[0]
+    return filters
+
+
+def _render(file, repeat):
+    from streamlit.testing.v1 import AppTest
+    page, key, tab = PAGES[file]
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=600)
+    at.session_state["logged_in"] = True
+    if key:
+        at.session_state[key] = tab
+    at.run()
+    first = _time(lambda: at.sidebar.radio[0].set_value(page).run())
+    warm = _time(at.run, repeat)
+    if at.exception:
+        raise RuntimeError(f"{file}: {at.exception[0].message}")
+    return first, warm
+
+
+def run_table(file, rows, repeat, seed):
+    # Benchmarks one table in the current directory; returns a list of results.
+    from mis_storage import (
+        append_row, count_rows, delete_row, open_export, read_page, read_table
+    )
+    results = []
+    add = lambda op, samples: results.append(_result(file, rows, op, samples))
+    add("synthesize", _time(lambda: _write_table(file, rows, seed)))
+    columns = table_columns(file)
+    add("fetch_cold", _time(lambda: read_table(file, columns)))
+    add("fetch_cached", _time(lambda: read_table(file, columns), repeat))
+    df = read_table(file, columns)
+    filters = _filters(file, df)
+    add("filtered_read_cold", _time(lambda: (count_rows(file, columns, filters), read_page(file, columns, 1, 50, None, True, filters))))
+    add("filtered_read", _time(lambda: (count_rows(file, columns, filters), read_page(file, columns, 1, 50, None, True, filters)), repeat))
+    add("sorted_page", _time(lambda: read_page(file, columns, 2, 50, columns[1], False), repeat))
+
+    def export():
+        with open_export(file, "csv"):
+            pass
+
+    add("export_csv", _time(export))
+    record = {c: str(v) for c, v in df.drop(columns="S.No").iloc[0].items() if pd.notna(v)}
+    add("insert", _time(lambda: append_row(file, record), WRITE_SAMPLES))
+    victims = iter(np.random.default_rng(seed).choice(np.arange(1, rows + 1), WRITE_SAMPLES, replace=False).tolist())
+    add("delete", _time(lambda: delete_row(file, next(victims)), WRITE_SAMPLES))
+    # The table is already cached by now, so a render measures the page itself:
+    # the first switch to it (filter indexes, sort orders) and plain reruns.
+    first, warm = _render(file, repeat)
+    add("page_render_first", first)
+    add("page_render", warm)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(APP_SCRIPT),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(sizes, tables, repeat, seed):
+    results = []
+    for rows in sizes:
+        for file in tables:
+            work = tempfile.mkdtemp(prefix="mis_bench_")
+            env = dict(os.environ, MIS_SNAPSHOT_DIR=os.path.join(work, ".mis_snapshots"))
+            if env.get("MIS_STORAGE") == "sqlite":
+                env["MIS_SQLITE_PATH"] = os.path.join(work, "content_mis.db")
+            try:
+                print(f"{file}: {rows} rows", file=sys.stderr)
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--worker", file, str(rows),
+                     "--repeat", str(repeat), "--seed", str(seed)],
+                    cwd=work, env=env, capture_output=True, text=True,
+                )
+                if out.returncode:
+                    raise RuntimeError(f"{file} at {rows} rows failed:\n{out.stderr}")
+                # The report is the worker's last line; anything before it is log output.
+                results += json.loads(out.stdout.strip().splitlines()[-1])
+            finally:
+                shutil.rmtree(work, ignore_errors=True)
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "backend": os.environ.get("MIS_STORAGE", "csv"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Content MIS storage and pages")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Table sizes in rows")
+    parser.add_argument("--tables", nargs="+", default=DEFAULT_TABLES, choices=sorted(PAGES))
+    parser.add_argument("--repeat", type=int, default=5, help="Runs of each repeated operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--worker", nargs=2, metavar=("TABLE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_table(args.worker[0], int(args.worker[1]), args.repeat, args.seed)))
+    else:
+        report = json.dumps(run_all(args.sizes, args.tables, args.repeat, args.seed), indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+        else:
+            print(report)
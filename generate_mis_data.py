@@ -0,0 +1,405 @@
+import argparse
+import datetime
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from mis_schema import (
+    DAILY_STATUS, ERROR_TYPES, FEEDBACK_SOURCES, LAYOUTS, LESSON_PLAN_QC_CRITERIA, TEXTBOOK_QC_CRITERIA,
+    WORKSHEET_QC_CRITERIA, table_columns, table_schema
+)
+
+# ----------------- Synthetic MIS Data -----------------
+# Seeded, realistic tables in the current layouts, for validating caching, indexing
+# and the KPI rollups against years of history rather than one sample row. Every
+# table gets its own generator seeded from (seed, table name), so a table comes out
+# the same whichever other tables are generated with it. Event tables (tasks, logs,
+# QC, feedback) get --rows rows each, dated on working days with the volume growing
+# over the years and dipping in the school holidays; the monthly KPI tables get one
+# row per month. Dates that would fall after --end are left blank, as work still in
+# progress. S.No follows the entry order, i.e. the dates.
+#
+#   python generate_mis_data.py --rows 100000 --years 3 --out mis_data
+#   python generate_mis_data.py --tables worksheet_qc.csv --rows 1000000 --seed 7
+DEFAULT_ROWS = 10000
+DEFAULT_YEARS = 3
+GROWTH = 2.0  # rows per day at the end of the span relative to its start
+MONTH_WEIGHTS = [1.0, 1.0, 1.1, 0.9, 0.5, 0.8, 1.1, 1.1, 1.0, 1.0, 0.9, 0.6]  # Jan..Dec
+
+# ----------------- Vocabulary -----------------
+TEAM = [
+    "Ms.Sheetal", "Mr.Shekhar", "Ms.Priya", "Mr.Rahul", "Ms.Anjali", "Mr.Vikram",
+    "Ms.Neha", "Mr.Arjun", "Ms.Kavya", "Mr.Rohan", "Ms.Sneha", "Mr.Aditya",
+]
+REVIEWERS = ["Mr.Shekhar", "Ms.Sheetal", "Ms.Neha", "Mr.Vikram"]
+SUBJECTS = {
+    "Robotics": ["Robotics Foundations", "LEGO Robotics", "Arduino Robotics", "Line Follower Bots", "Humanoid Robotics"],
+    "Coding": ["Scratch Programming", "Python for Kids", "Python Advanced", "Web Development", "App Inventor"],
+    "AI & ML": ["AI Explorers", "Machine Learning Basics", "Computer Vision", "Chatbots with AI"],
+    "Electronics": ["Basic Electronics", "Circuit Design", "Sensors and Actuators"],
+    "IoT": ["IoT with ESP32", "Smart Home Projects", "IoT Cloud Dashboards"],
+    "3D Design": ["3D Modelling", "3D Printing Lab", "CAD for Makers"],
+    "Drones": ["Drone Technology", "Drone Programming"],
+}
+CATEGORY_OF = {course: subject for subject, courses in SUBJECTS.items() for course in courses}
+COURSES = [f"{course} - Grade {grade}" for course in CATEGORY_OF for grade in range(3, 11)]
+ARTIFACTS = ["lesson plan", "worksheet", "textbook chapter", "assessment", "project guide", "slide deck", "teacher notes"]
+TASK_VERBS = ["Drafted", "Revised", "Reviewed", "Formatted", "Updated", "Proofread", "Designed visuals for"]
+TRAININGS = [
+    "Instructional Design Basics", "Bloom's Taxonomy Workshop", "Canva for Educators", "Python Refresher",
+    "Arduino Hands-on", "Assessment Design", "Accessibility in Content", "AI Tools for Content Creation",
+    "Style Guide Walkthrough", "Curriculum Mapping",
+]
+NOTES = [
+    "Shared with the trainer team for review", "Aligned with the latest curriculum standard",
+    "Images need higher resolution", "Activity timing adjusted for a 45 minute class",
+    "Added extension tasks for fast learners", "Waiting on inputs from the subject expert",
+    "Terminology made consistent across chapters", "Answer key cross-checked",
+    "Diagrams redrawn to match the kit", "Simplified language for younger grades",
+    "Safety instructions added to the experiment", "Version history updated",
+    "Follow-up planned in the next review cycle", "Feedback from the pilot batch incorporated",
+]
+CORRECTIONS = {
+    "Formatting": ["Fixed heading styles and numbering", "Realigned tables and images"],
+    "Grammar": ["Corrected grammar and punctuation", "Rewrote unclear sentences"],
+    "Content": ["Replaced outdated example", "Added missing learning outcome"],
+    "Incorrect Data": ["Corrected values against the source", "Updated component specifications"],
+    "Other": ["Escalated to the content lead", "Clarified with the author"],
+}
+SUGGESTIONS = [
+    "More hands-on activities", "Shorter theory sections", "Add video walkthroughs",
+    "Clearer wiring diagrams", "More practice questions", "Include real-world examples",
+    "Update screenshots to the new software version", "Provide printable worksheets",
+    "Add a recap at the end of each session", "Increase difficulty for senior grades",
+]
+ACTIONS = [
+    "Activities added in the next revision", "Forwarded to the course author", "Diagrams updated",
+    "Question bank extended", "Discussed in the monthly review", "Screenshots refreshed",
+]
+VERDICTS = ["Excellent", "Good", "Meets standard", "Needs minor edits", "Needs rework"]
+VERDICT_WEIGHTS = [0.15, 0.35, 0.3, 0.15, 0.05]
+
+
+# ----------------- Building Blocks -----------------
+def _weights(n, skew=1.0):
+    # Zipf-like shares, so a few members, courses or reviewers account for most rows.
+    w = 1 / np.arange(1, n + 1) ** skew
+    return w / w.sum()
+
+
+def _pick(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=p)]
+
+
+def _event_dates(rng, n, start, end):
+    # Sorted working days in [start, end]: the daily volume grows linearly by GROWTH
+    # over the span, and months are thinned by MONTH_WEIGHTS (school holidays).
+    span = (end - start).days + 1
+    g = GROWTH - 1
+    accept = np.asarray(MONTH_WEIGHTS) / max(MONTH_WEIGHTS)
+    days = np.empty(0, dtype="datetime64[D]")
+    while len(days) < n:
+        u = rng.random(2 * n)
+        x = (np.sqrt(1 + u * g * (2 + g)) - 1) / g if g else u
+        candidates = np.datetime64(start) + np.minimum((x * span).astype("int64"), span - 1).astype("timedelta64[D]")
+        months = candidates.astype("datetime64[M]").astype("int64") % 12
+        keep = (rng.random(len(candidates)) < accept[months]) & np.is_busday(candidates)
+        days = np.concatenate([days, candidates[keep]])
+    return np.sort(days[:n])
+
+
+def _lag(rng, n, mean_days):
+    # Days until the next step of a workflow: at least one, gamma-distributed.
+    return np.maximum(1, np.round(rng.gamma(2.0, mean_days / 2, n))).astype("timedelta64[D]")
+
+
+def _dates(days, end, fmt="%Y-%m-%d"):
+    # Formatted dates, blank for NaT and for anything after end.
+    days = pd.DatetimeIndex(days)
+    days = days.where(days <= pd.Timestamp(end))
+    return pd.Series(days.strftime(fmt), dtype=object).where(days.notna(), None).to_numpy()
+
+
+def _text(rng, n, fragments, mean_parts=1.5, blank=0.0):
+    # Free text of one or more fragments, Poisson-distributed in length; a share of
+    # cells left blank, like optional form fields.
+    fragments = np.asarray(fragments, dtype=object)
+    parts = 1 + rng.poisson(mean_parts - 1, n)
+    texts = fragments[rng.integers(0, len(fragments), n)]
+    for k in range(1, parts.max(initial=1)):
+        more = parts > k
+        texts[more] = texts[more] + ". " + fragments[rng.integers(0, len(fragments), more.sum())]
+    texts = texts + "."
+    if blank:
+        texts[rng.random(n) < blank] = None
+    return texts
+
+
+def _members(rng, n):
+    return _pick(rng, TEAM, n, _weights(len(TEAM), 0.6))
+
+
+def _courses(rng, n):
+    return _pick(rng, COURSES, n, _weights(len(COURSES), 0.8))
+
+
+def _months(start, end):
+    return pd.date_range(pd.Timestamp(start).replace(day=1), end, freq="MS")
+
+
+# ----------------- Table Generators -----------------
+# Each returns a frame of the table's columns (any it leaves out stay blank).
+def _daily_tasks(rng, rows, start, end):
+    days = _event_dates(rng, rows, start, end)
+    courses = _courses(rng, rows)
+    recent = days > np.datetime64(end) - np.timedelta64(14, "D")
+    status = np.where(
+        recent,
+        _pick(rng, DAILY_STATUS, rows, [0.3, 0.4, 0.3]),
+        _pick(rng, DAILY_STATUS, rows, [0.02, 0.03, 0.95]),
+    )
+    return pd.DataFrame({
+        "Date": _dates(days, end),
+        "Team Member": _members(rng, rows),
+        "Task Description": [
+            f"{verb} {artifact} for {course}" for verb, artifact, course
+            in zip(_pick(rng, TASK_VERBS, rows), _pick(rng, ARTIFACTS, rows), courses)
+        ],
+        "Time Spent (Hrs)": np.clip(np.round(rng.gamma(2.0, 1.2, rows) * 2) / 2, 0.5, 8.0),
+        "Status": status,
+    })
+
+
+def _training(rng, rows, start, end):
+    return pd.DataFrame({
+        "Date": _dates(_event_dates(rng, rows, start, end), end),
+        "Team Member": _members(rng, rows),
+        "Training Name": _pick(rng, TRAININGS, rows),
+        "Duration (Hrs)": _pick(rng, [1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0], rows, [0.2, 0.2, 0.25, 0.15, 0.1, 0.05, 0.05]),
+        "Feedback": _text(rng, rows, NOTES, 1.3, blank=0.3),
+    })
+
+
+def _audit_logs(rng, rows, start, end):
+    errors = _pick(rng, ERROR_TYPES, rows, [0.3, 0.25, 0.2, 0.15, 0.1])
+    return pd.DataFrame({
+        "Date": _dates(_event_dates(rng, rows, start, end), end),
+        "Team Member": _members(rng, rows),
+        "Document/Task": [
+            f"{artifact.capitalize()} - {course}"
+            for artifact, course in zip(_pick(rng, ARTIFACTS, rows), _courses(rng, rows))
+        ],
+        "Error Type": errors,
+        "Correction Action": [CORRECTIONS[e][i] for e, i in zip(errors, rng.integers(0, 2, rows))],
+        "Remarks": _text(rng, rows, NOTES, 1.2, blank=0.5),
+    })
+
+
+def _mis_kpis(rng, rows, start, end):
+    # One row per month of the span; rows is ignored.
+    months = _months(start, end)
+    n = len(months)
+    feedback = rng.poisson(15, n)
+    return pd.DataFrame({
+        "Month": months.strftime("%B %Y"),
+        "Curriculum Modules Built": rng.poisson(8, n).astype(float),
+        "Modules Revised": rng.poisson(5, n).astype(float),
+        "Quality Checks Done": rng.poisson(20, n).astype(float),
+        "Average QC Score (%)": np.round(np.clip(rng.normal(82, 6, n), 50, 100), 1),
+        "Turnaround Time (Days)": np.round(rng.gamma(4.0, 1.5, n), 1),
+        "Content Feedback Items": feedback.astype(float),
+        "Content Updated Based on Feedback": rng.binomial(feedback, 0.7).astype(float),
+        "Pending Requests": rng.poisson(4, n).astype(float),
+        "Notes/Challenges": _text(rng, n, NOTES, 2.0, blank=0.2),
+    })
+
+
+def _primary_audit(rng, rows, start, end):
+    updated = _event_dates(rng, rows, start, end)
+    due = updated + _lag(rng, rows, 180)
+    courses = _courses(rng, rows)
+    age = (np.datetime64(end) - updated).astype(int)
+    # Older content is more likely to be outdated or archived; the action and remark
+    # follow the status.
+    status = np.where(
+        rng.random(rows) < np.clip(age / 1000, 0.05, 0.7),
+        _pick(rng, ["Outdated", "Archived"], rows, [0.7, 0.3]),
+        "Active",
+    )
+    action = pd.Series(status).map({"Outdated": "Revise", "Active": "Keep Active", "Archived": "Archive"}).to_numpy()
+    remark = pd.Series(status).map(
+        {"Outdated": "Tools outdated", "Active": "Aligns with curriculum", "Archived": "Replaced by new module"}
+    ).to_numpy()
+    assigned = _members(rng, rows)
+    reviewed = _pick(rng, REVIEWERS, rows)
+    reviewed = np.where(reviewed == assigned, REVIEWERS[0], reviewed)
+    return pd.DataFrame({
+        "Course Name": courses,
+        "Category": [CATEGORY_OF[c.rsplit(" - ", 1)[0]] for c in courses],
+        "Last Updated": _dates(updated, end),
+        "Status": status,
+        "Usage Analytics": _pick(rng, ["Low", "Medium", "Very Low"], rows, [0.35, 0.5, 0.15]),
+        "QC Score (/5)": _pick(rng, [1, 2, 3, 4, 5], rows, [0.03, 0.07, 0.25, 0.4, 0.25]),
+        "Audit Due Date": _dates(due, end + datetime.timedelta(days=365)),
+        "Action Required": action,
+        "Remarks": remark,
+        "Assigned To": assigned,
+        "Reviewed By": reviewed,
+        "Final Decision": _dates(due + _lag(rng, rows, 10), end),
+    })
+
+
+def _audit_calendar(rng, rows, start, end):
+    deadlines = _event_dates(rng, rows, start, end + datetime.timedelta(days=90))
+    past = deadlines < np.datetime64(end)
+    progress = np.where(
+        past,
+        np.where(rng.random(rows) < 0.9, 100, rng.integers(40, 100, rows)),
+        np.round(rng.integers(0, 100, rows), -1),
+    )
+    status = np.select(
+        [progress == 100, progress == 0, past],
+        ["Completed", "Planned", "Delayed"],
+        "In Progress",
+    )
+    return pd.DataFrame({
+        "Month": pd.DatetimeIndex(deadlines).strftime("%B %Y"),
+        "Courses for Audit": [", ".join(_courses(rng, k)) for k in rng.integers(1, 5, rows)],
+        "Assigned To": _members(rng, rows),
+        "Deadline": _dates(deadlines, end + datetime.timedelta(days=90)),
+        "Progress (%)": progress,
+        "Status": status,
+        "Notes": _text(rng, rows, NOTES, 1.5, blank=0.3),
+    })
+
+
+def _feedback(rng, rows, start, end):
+    received = _event_dates(rng, rows, start, end)
+    rating = _pick(rng, [1, 2, 3, 4, 5], rows, [0.05, 0.1, 0.2, 0.35, 0.3])
+    # Low ratings come with more suggestions and are acted on more often.
+    suggestions = np.where(rating <= 2, _text(rng, rows, SUGGESTIONS, 2.5), _text(rng, rows, SUGGESTIONS, 1.2))
+    acted = rng.random(rows) < np.where(rating <= 2, 0.9, 0.5)
+    return pd.DataFrame({
+        "Course Name": _courses(rng, rows),
+        "Feedback Source": _pick(rng, FEEDBACK_SOURCES, rows, [0.4, 0.6]),
+        "Rating (1-5)": rating,
+        "Key Suggestions": suggestions,
+        "Action Taken": np.where(acted, _text(rng, rows, ACTIONS, 1.2), None),
+        "Date Received": _dates(received, end),
+        "Follow-up Date": _dates(np.where(acted, received + _lag(rng, rows, 14), np.datetime64("NaT")), end),
+    })
+
+
+def _qc(criteria):
+    def generate(rng, rows, start, end):
+        # Submitted -> QC 1 feedback -> revised content back -> (for most) a second
+        # round; UPDATED DATE is the last version received.
+        submitted = _event_dates(rng, rows, start, end)
+        qc1 = submitted + _lag(rng, rows, 3)
+        received1 = qc1 + _lag(rng, rows, 4)
+        second = rng.random(rows) < 0.7
+        qc2 = np.where(second, received1 + _lag(rng, rows, 2), np.datetime64("NaT"))
+        received2 = qc2 + _lag(rng, rows, 3)
+        updated = np.where(second, received2, received1)
+        data = {
+            "COURSE NAME": _courses(rng, rows),
+            "CONTENT SUBMITTED ON": _dates(submitted, end),
+            "VERSION": [f"v{major}.{minor}" for major, minor in zip(rng.integers(1, 4, rows), rng.integers(0, 10, rows))],
+            "UPDATED DATE": _dates(updated, end),
+            "QC 1 FEEDBACK DATE": _dates(qc1, end),
+            "QC 1 CONTENT RECEIVED ON": _dates(received1, end),
+            "QC 2 FEEDBACK DATE": _dates(qc2, end),
+            "QC 2 CONTENT RECEIVED ON": _dates(received2, end),
+            "REMARKS": _text(rng, rows, NOTES, 1.8, blank=0.2),
+            "QC REVIEWER": _pick(rng, REVIEWERS, rows, _weights(len(REVIEWERS), 0.5)),
+        }
+        for column in criteria[5:]:
+            verdict = _pick(rng, VERDICTS, rows, VERDICT_WEIGHTS)
+            detail = _text(rng, rows, NOTES, 1.0)
+            data[column] = np.where(np.isin(verdict, VERDICTS[3:]), verdict + ": " + detail.astype(str), verdict)
+        return pd.DataFrame(data)
+    return generate
+
+
+def _generic(file):
+    # Tables without a generator of their own (the KPI reference tables) get values
+    # by schema kind.
+    def generate(rng, rows, start, end):
+        schema = table_schema(file)
+        data = {}
+        for column in table_columns(file)[1:]:
+            kind = schema.get(column)
+            if kind in ("date", "month"):
+                data[column] = _dates(_event_dates(rng, rows, start, end), end, "%Y-%m-%d" if kind == "date" else "%B %Y")
+            elif kind in ("float", "int"):
+                data[column] = rng.integers(1, 100, rows)
+            elif isinstance(kind, list):
+                data[column] = _pick(rng, kind, rows)
+            else:
+                data[column] = _text(rng, rows, NOTES, 1.3)
+        return pd.DataFrame(data)
+    return generate
+
+
+GENERATORS = {
+    "content_team_daily_tasks.csv": _daily_tasks,
+    "content_team_training_tracker.csv": _training,
+    "content_team_audit_logs.csv": _audit_logs,
+    "content_team_mis_kpis.csv": _mis_kpis,
+    "mis_template.csv": _mis_kpis,
+    "primary_content_audit.csv": _primary_audit,
+    "audit_calendar.csv": _audit_calendar,
+    "feedback_summary.csv": _feedback,
+    "lesson_plan_qc.csv": _qc(LESSON_PLAN_QC_CRITERIA),
+    "textbook_qc.csv": _qc(TEXTBOOK_QC_CRITERIA),
+    "worksheet_qc.csv": _qc(WORKSHEET_QC_CRITERIA),
+}
+
+
+def generate_table(file, rows=DEFAULT_ROWS, seed=0, end=None, years=DEFAULT_YEARS):
+    # The table as a frame of its current columns with S.No 1..n, cells as written
+    # by the forms (ISO dates, "June 2025" months, blank for missing).
+    name = os.path.basename(file)
+    end = end or datetime.date.today()
+    start = end - datetime.timedelta(days=round(365.25 * years)) + datetime.timedelta(days=1)
+    rng = np.random.default_rng([seed, zlib.crc32(name.encode())])
+    df = GENERATORS.get(name, _generic(name))(rng, rows, start, end)
+    df.insert(0, "S.No", np.arange(1, len(df) + 1))
+    return df.reindex(columns=table_columns(name))
+
+
+def write_tables(directory, files, rows=DEFAULT_ROWS, seed=0, end=None, years=DEFAULT_YEARS, force=False):
+    # Writes each table into directory; returns {file: rows written}. An existing
+    # table is only replaced with force, and then its tombstones and journal go too,
+    # since their S.No values and offsets belong to the old rows.
+    from mis_storage import _journal_file, _tombstone_file, atomic_write_csv
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+    for file in files:
+        path = os.path.join(directory, file)
+        if os.path.exists(path) and not force:
+            raise FileExistsError(f"{path} exists; pass --force to replace it")
+        df = generate_table(file, rows, seed, end, years)
+        for stale in (_tombstone_file(path), _journal_file(path)):
+            if os.path.exists(stale):
+                os.remove(stale)
+        atomic_write_csv(df, path)
+        written[file] = len(df)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic Content MIS tables")
+    parser.add_argument("--out", default="mis_data", help="Directory to write the tables to (default: mis_data)")
+    parser.add_argument("--tables", nargs="+", default=sorted(LAYOUTS), choices=sorted(LAYOUTS))
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows per event table")
+    parser.add_argument("--years", type=float, default=DEFAULT_YEARS, help="Years of history")
+    parser.add_argument("--end", type=datetime.date.fromisoformat, help="Last day of history (default: today)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true", help="Replace tables that already exist")
+    args = parser.parse_args()
+
+    for file, count in write_tables(args.out, args.tables, args.rows, args.seed, args.end, args.years, args.force).items():
+        print(f"{os.path.join(args.out, file)}: {count} rows")
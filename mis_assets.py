@@ -0,0 +1,79 @@
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+
+import streamlit as st
+
+try:
+    from PIL import Image
+except ImportError:  # serve the original files untouched
+    Image = None
+
+# Streamlit serves this folder at app/static/ when server.enableStaticServing is on
+# (see .streamlit/config.toml). It has to sit next to the app scripts.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+MAX_WIDTH = 1920
+WEBP_QUALITY = 80
+
+# Process-wide asset cache: (path, mtime, size) -> asset dict. Images are read, hashed
+# and recompressed once per process instead of on every rerun.
+_ASSETS = {}
+
+
+def _optimize(raw, path):
+    # Downsize to MAX_WIDTH and recompress to WebP, keeping the original whenever
+    # that does not actually make the file smaller.
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    ext = os.path.splitext(path)[1]
+    if Image is None:
+        return raw, mime, ext
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            if img.width > MAX_WIDTH:
+                img = img.resize((MAX_WIDTH, round(img.height * MAX_WIDTH / img.width)))
+            out = io.BytesIO()
+            img.save(out, "WEBP", quality=WEBP_QUALITY)
+    except (OSError, ValueError):
+        return raw, mime, ext
+    if out.tell() >= len(raw):
+        return raw, mime, ext
+    return out.getvalue(), "image/webp", ".webp"
+
+
+def load_asset(path):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    asset = _ASSETS.get(key)
+    if asset is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()[:12]
+        data, mime, ext = _optimize(raw, path)
+        stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+        asset = {"data": data, "mime": mime, "name": f"{stem}-{digest}{ext}", "uri": None}
+        _ASSETS[key] = asset
+    return asset
+
+
+def asset_url(path):
+    # With static serving the browser fetches a content-hashed URL once and caches
+    # it; otherwise fall back to an inline data URI, encoded once per process.
+    asset = load_asset(path)
+    if st.get_option("server.enableStaticServing"):
+        target = os.path.join(STATIC_DIR, asset["name"])
+        if not os.path.exists(target):
+            os.makedirs(STATIC_DIR, exist_ok=True)
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(asset["data"])
+            os.replace(tmp, target)
+        return f"app/static/{asset['name']}"
+    if asset["uri"] is None:
+        asset["uri"] = f"data:{asset['mime']};base64,{base64.b64encode(asset['data']).decode()}"
+    return asset["uri"]
+
+
+def image_html(path, width="100%"):
+    return f"<img src='{asset_url(path)}' style='width: {width};'>"
@@ -0,0 +1,159 @@
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from mis_schema import LAYOUTS, table_schema
+from mis_storage import add_write_hook, get_storage, read_table
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_TYPED_KINDS = ("date", "month", "float", "int")
+
+
+def text_columns(file, header):
+    # Every column that holds text: not S.No and not a date or number.
+    schema = table_schema(file)
+    return [c for c in header if c != "S.No" and schema.get(c) not in _TYPED_KINDS]
+
+
+def _text_values(df, columns):
+    return [df[c].astype("string").fillna("").tolist() for c in columns]
+
+
+# ----------------- Full-Text Index -----------------
+# An in-memory SQLite FTS5 table per MIS table, with rowid = S.No and one column per
+# text column, so a search is an indexed MATCH ranked by bm25 instead of a scan of
+# every cell. Each table's index is built once from its current contents and then
+# kept current by the storage write hooks (insert -> INSERT, delete -> DELETE by
+# rowid). An index that misses a write is dropped and rebuilt on the next search.
+# Without FTS5 in the sqlite3 build, search() falls back to scanning the tables.
+SEARCH_TABLES = sorted(LAYOUTS)
+SEARCH_LIMIT = 50
+
+_DB = sqlite3.connect(":memory:", check_same_thread=False)
+_DB_LOCK = threading.Lock()
+try:
+    _DB.execute("CREATE VIRTUAL TABLE _fts5_probe USING fts5(x)")
+    _DB.execute("DROP TABLE _fts5_probe")
+    HAS_FTS5 = True
+except sqlite3.OperationalError:
+    HAS_FTS5 = False
+
+# file -> (table version, indexed column names)
+_INDEXED = {}
+
+
+def _fts_name(file):
+    return "fts_" + re.sub(r"\W", "_", file)
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _insert_rows(file, columns, df):
+    _DB.executemany(
+        f"INSERT INTO {_fts_name(file)} (rowid, {', '.join(_quote(c) for c in columns)}) "
+        f"VALUES (?{', ?' * len(columns)})",
+        zip(df["S.No"].astype("int64").tolist(), *_text_values(df, columns)),
+    )
+
+
+def _build_index(file):
+    storage = get_storage()
+    version = storage.version(file)
+    if version is None:
+        return None
+    df = read_table(file, [])
+    columns = text_columns(file, df.columns)
+    if storage.version(file) != version:
+        return None
+    with _DB_LOCK:
+        _DB.execute(f"DROP TABLE IF EXISTS {_fts_name(file)}")
+        _DB.execute(
+            f"CREATE VIRTUAL TABLE {_fts_name(file)} USING fts5("
+            f"{', '.join(_quote(c) for c in columns) or _quote('_')}, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        if columns:
+            _insert_rows(file, columns, df)
+        _INDEXED[file] = (version, columns)
+    return columns
+
+
+def _ensure_index(file):
+    cached = _INDEXED.get(file)
+    if cached is not None and cached[0] == get_storage().version(file):
+        return cached[1]
+    return _build_index(file)
+
+
+def _on_write(event, file, before, after, payload):
+    if not HAS_FTS5:
+        return
+    with _DB_LOCK:
+        cached = _INDEXED.get(file)
+        if cached is None:
+            return
+        columns = cached[1]
+        if cached[0] != before or event == "rewrite" or (
+            event == "append" and (payload is None or any(c not in payload for c in columns))
+        ):
+            del _INDEXED[file]
+            return
+        if event == "append":
+            _insert_rows(file, columns, payload)
+        elif event == "delete":
+            _DB.execute(f"DELETE FROM {_fts_name(file)} WHERE rowid = ?", (int(payload["S.No"].iloc[0]),))
+        _INDEXED[file] = (after, columns)
+
+
+add_write_hook(_on_write)
+
+
+def _match_query(query):
+    # Every word must match, as a prefix; quoting keeps FTS5 operators out of it.
+    return " ".join('"' + token + '"*' for token in _TOKEN.findall(query.lower()))
+
+
+def _scan(file, tokens, limit):
+    df = read_table(file, [])
+    columns = text_columns(file, df.columns)
+    if df.empty or not columns:
+        return []
+    text = df[columns].astype("string").fillna("").agg(" ".join, axis=1)
+    hits = pd.Series(True, index=df.index)
+    for token in tokens:
+        hits &= text.str.lower().str.contains(token, regex=False)
+    return [(file, int(s_no), 0.0, match[:120]) for s_no, match in zip(df.loc[hits, "S.No"], text[hits])][:limit]
+
+
+def search(query, limit=SEARCH_LIMIT):
+    # Ranked hits as a DataFrame (Table, S.No, Match, Score); lower score is better.
+    columns = ["Table", "S.No", "Match", "Score"]
+    match = _match_query(query)
+    if not match:
+        return pd.DataFrame(columns=columns)
+    hits = []
+    for file in SEARCH_TABLES:
+        if not HAS_FTS5:
+            hits += _scan(file, _TOKEN.findall(query.lower()), limit)
+            continue
+        if not _ensure_index(file):
+            continue
+        with _DB_LOCK:
+            if file not in _INDEXED:
+                continue
+            name = _fts_name(file)
+            rows = _DB.execute(
+                f"SELECT rowid, bm25({name}), snippet({name}, -1, '«', '»', '…', 12) "
+                f"FROM {name} WHERE {name} MATCH ? ORDER BY bm25({name}) LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        hits += [(file, s_no, score, snippet) for s_no, score, snippet in rows]
+    hits.sort(key=lambda hit: hit[2])
+    return pd.DataFrame(
+        [(file.rsplit(".", 1)[0], s_no, snippet, score) for file, s_no, score, snippet in hits[:limit]],
+        columns=columns,
+    )
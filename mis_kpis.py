@@ -0,0 +1,385 @@
+import collections
+import threading
+
+import pandas as pd
+
+from mis_schema import QC_DATE_COLUMNS
+from mis_snapshots import read_columns
+from mis_storage import add_write_hook, get_storage
+
+# ----------------- Monthly KPIs -----------------
+# The MIS template metrics, derived from the logs instead of typed in by hand:
+#   Curriculum Modules Built           QC'd items (table + course) by first submission month
+#   Modules Revised                    QC entries whose UPDATED DATE is after submission
+#   Quality Checks Done                QC 1 and QC 2 feedback given in the month
+#   Average QC Score (%)               primary content audit "QC Score (/5)" as a percentage
+#   Turnaround Time (Days)             submission -> QC 1 feedback, mean per submission month
+#   Content Feedback Items             feedback received in the month
+#   Content Updated Based on Feedback  feedback received in the month with an action taken
+#   Pending Requests                   daily tasks dated in the month and not completed
+QC_TABLES = ["lesson_plan_qc.csv", "textbook_qc.csv", "worksheet_qc.csv"]
+FEEDBACK_TABLE = "feedback_summary.csv"
+AUDIT_TABLE = "primary_content_audit.csv"
+DAILY_TASK_TABLE = "content_team_daily_tasks.csv"
+TRAINING_TABLE = "content_team_training_tracker.csv"
+ERROR_LOG_TABLE = "content_team_audit_logs.csv"
+
+QC_KPI_COLUMNS = ["COURSE NAME", "CONTENT SUBMITTED ON", "UPDATED DATE", "QC 1 FEEDBACK DATE", "QC 2 FEEDBACK DATE"]
+KPI_COLUMNS = [
+    "Month", "Curriculum Modules Built", "Modules Revised", "Quality Checks Done",
+    "Average QC Score (%)", "Turnaround Time (Days)", "Content Feedback Items",
+    "Content Updated Based on Feedback", "Pending Requests",
+]
+MEMBER_KPI_COLUMNS = [
+    "Team Member", "Tasks Logged", "Tasks Completed", "Task Hours", "Trainings", "Training Hours",
+    "Errors Logged",
+]
+COURSE_KPI_COLUMNS = [
+    "Course Name", "QC Entries", "Turnaround Time (Days)", "Feedback Items", "Average Rating (1-5)",
+]
+
+
+def _dates(df, column):
+    return pd.to_datetime(df[column], errors="coerce")
+
+
+def _months(dates):
+    return dates.dt.to_period("M")
+
+
+def _text(values):
+    return values.astype("string").fillna("")
+
+
+# ----------------- Rollup Cells -----------------
+# Every KPI is a sum (or a ratio of two sums) over rows, so each source row adds fixed
+# amounts to a few (view, key, measure) cells:
+#   "month"    key is the month
+#   "member"   key is the team member
+#   "course"   key is the course name
+#   "qc_item"  key is (table, course, submission month), for first-submission counts
+# A table's rollup is the sum of its rows' cells. Built once from the table, it is
+# then kept current by the storage write hooks: an insert adds the new row's cells, a
+# delete subtracts the deleted row's. The dashboards read O(months + members +
+# courses) cells instead of scanning every row on each rerun.
+def _cells(view, keys, measure, values=1.0, mask=None):
+    # Sums per key as (view, measure, Series); several key columns make tuple keys.
+    keys = keys if isinstance(keys, list) else [keys]
+    if not isinstance(values, pd.Series):
+        values = pd.Series(values, index=keys[0].index, dtype="float64")
+    keep = values.notna()
+    for key in keys:
+        keep &= key.notna()
+    if mask is not None:
+        keep &= mask
+    by = [key[keep] for key in keys]
+    return view, measure, values[keep].groupby(by if len(by) > 1 else by[0], sort=False).sum()
+
+
+def _qc_cells(df, file):
+    submitted = _dates(df, "CONTENT SUBMITTED ON")
+    updated = _dates(df, "UPDATED DATE")
+    qc1 = _dates(df, "QC 1 FEEDBACK DATE")
+    qc2 = _dates(df, "QC 2 FEEDBACK DATE")
+    course = _text(df["COURSE NAME"])
+    named = course != ""
+    tat = (qc1 - submitted).dt.days.astype("float64")
+    month = _months(submitted)
+    table = pd.Series(file, index=df.index)
+    return [
+        _cells("qc_item", [table, course, month], "submissions"),
+        _cells("month", _months(updated), "revised", mask=updated > submitted),
+        _cells("month", _months(qc1), "checks"),
+        _cells("month", _months(qc2), "checks"),
+        _cells("month", month, "tat_sum", tat),
+        _cells("month", month, "tat_n", mask=tat.notna()),
+        _cells("course", course, "qc_entries", mask=named),
+        _cells("course", course, "tat_sum", tat, mask=named),
+        _cells("course", course, "tat_n", mask=named & tat.notna()),
+    ]
+
+
+def _feedback_cells(df, file):
+    month = _months(_dates(df, "Date Received"))
+    course = _text(df["Course Name"])
+    rating = pd.to_numeric(df["Rating (1-5)"], errors="coerce").astype("float64")
+    return [
+        _cells("month", month, "feedback"),
+        _cells("month", month, "acted", mask=_text(df["Action Taken"]).str.strip() != ""),
+        _cells("course", course, "feedback", mask=course != ""),
+        _cells("course", course, "rating_sum", rating, mask=course != ""),
+        _cells("course", course, "rating_n", mask=(course != "") & rating.notna()),
+    ]
+
+
+def _audit_cells(df, file):
+    month = _months(_dates(df, "Last Updated"))
+    score = pd.to_numeric(df["QC Score (/5)"], errors="coerce").astype("float64") * 20
+    return [
+        _cells("month", month, "score_sum", score),
+        _cells("month", month, "score_n", mask=score.notna()),
+    ]
+
+
+def _daily_task_cells(df, file):
+    member = _text(df["Team Member"]).replace("", pd.NA)
+    done = _text(df["Status"]) == "Completed"
+    hours = pd.to_numeric(df["Time Spent (Hrs)"], errors="coerce").astype("float64")
+    return [
+        _cells("month", _months(_dates(df, "Date")), "pending", mask=~done),
+        _cells("member", member, "tasks"),
+        _cells("member", member, "tasks_done", mask=done),
+        _cells("member", member, "task_hours", hours),
+    ]
+
+
+def _training_cells(df, file):
+    member = _text(df["Team Member"]).replace("", pd.NA)
+    hours = pd.to_numeric(df["Duration (Hrs)"], errors="coerce").astype("float64")
+    return [
+        _cells("member", member, "trainings"),
+        _cells("member", member, "training_hours", hours),
+    ]
+
+
+def _error_log_cells(df, file):
+    return [_cells("member", _text(df["Team Member"]).replace("", pd.NA), "errors")]
+
+
+# Source table -> (columns its cells need, cell function)
+ROLLUP_SOURCES = {
+    **{file: (QC_KPI_COLUMNS, _qc_cells) for file in QC_TABLES},
+    FEEDBACK_TABLE: (["Course Name", "Rating (1-5)", "Date Received", "Action Taken"], _feedback_cells),
+    AUDIT_TABLE: (["Last Updated", "QC Score (/5)"], _audit_cells),
+    DAILY_TASK_TABLE: (["Date", "Team Member", "Time Spent (Hrs)", "Status"], _daily_task_cells),
+    TRAINING_TABLE: (["Team Member", "Duration (Hrs)"], _training_cells),
+    ERROR_LOG_TABLE: (["Team Member"], _error_log_cells),
+}
+
+
+def _sum_cells(file, df):
+    columns, cells = ROLLUP_SOURCES[file]
+    totals = collections.Counter()
+    for view, measure, sums in cells(df.reindex(columns=columns), file):
+        for key, value in sums.items():
+            totals[(view, key, measure)] += value
+    return totals
+
+
+# ----------------- Materialized Rollups -----------------
+# file -> (table version, Counter of (view, key, measure) -> value)
+_ROLLUPS = {}
+_ROLLUP_LOCK = threading.Lock()
+
+
+def _rollup(file):
+    storage = get_storage()
+    version = storage.version(file)
+    with _ROLLUP_LOCK:
+        cached = _ROLLUPS.get(file)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+    if version is None:
+        return collections.Counter()
+    totals = _sum_cells(file, read_columns(file, ROLLUP_SOURCES[file][0]))
+    # Only keep it when no write landed during the read; that write's hook would
+    # otherwise count its row a second time.
+    if storage.version(file) == version:
+        with _ROLLUP_LOCK:
+            _ROLLUPS[file] = (version, totals)
+    return totals
+
+
+def _on_write(event, file, before, after, payload):
+    if file not in ROLLUP_SOURCES:
+        return
+    with _ROLLUP_LOCK:
+        cached = _ROLLUPS.get(file)
+        if cached is None:
+            return
+        columns = ROLLUP_SOURCES[file][0]
+        if cached[0] != before or event == "rewrite" or (
+            event in ("append", "delete") and (payload is None or any(c not in payload for c in columns))
+        ):
+            # Missed a write or lack the row's values: rebuild on the next read.
+            del _ROLLUPS[file]
+            return
+        # Copy, so readers iterating the previous totals are not disturbed.
+        totals = collections.Counter(cached[1])
+        if event in ("append", "delete"):
+            sign = 1 if event == "append" else -1
+            for cell, value in _sum_cells(file, payload).items():
+                totals[cell] += sign * value
+                if abs(totals[cell]) < 1e-9:
+                    del totals[cell]
+        _ROLLUPS[file] = (after, totals)
+
+
+add_write_hook(_on_write)
+
+
+def _view(view, files):
+    # {key: {measure: value}} summed over the given tables' rollups.
+    out = collections.defaultdict(dict)
+    for file in files:
+        for (cell_view, key, measure), value in _rollup(file).items():
+            if cell_view == view:
+                out[key][measure] = out[key].get(measure, 0.0) + value
+    return pd.DataFrame.from_dict(out, orient="index")
+
+
+def _measure(df, name):
+    return df[name] if name in df.columns else pd.Series(float("nan"), index=df.index)
+
+
+def _mean(df, name):
+    # Cells that sum to zero are dropped from the rollup, so a missing sum is 0.
+    return _measure(df, name + "_sum").fillna(0) / _measure(df, name + "_n")
+
+
+# Finished KPI frames, memoized on the versions of their source tables: (name) ->
+# (versions, DataFrame). A rerun over unchanged tables costs a stat() per table.
+_KPIS = {}
+
+
+def _memoized(name, files, compute):
+    storage = get_storage()
+    key = tuple(storage.version(file) for file in files)
+    cached = _KPIS.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, compute())
+        _KPIS[name] = cached
+    return cached[1]
+
+
+def monthly_kpis():
+    return _memoized("monthly", list(ROLLUP_SOURCES), _monthly_kpis)
+
+
+def member_kpis():
+    return _memoized("member", [DAILY_TASK_TABLE, TRAINING_TABLE, ERROR_LOG_TABLE], _member_kpis)
+
+
+def course_kpis():
+    return _memoized("course", QC_TABLES + [FEEDBACK_TABLE], _course_kpis)
+
+
+def _monthly_kpis():
+    months = _view("month", ROLLUP_SOURCES)
+    items = _view("qc_item", QC_TABLES)
+    built = pd.Series(dtype="float64")
+    if not items.empty:
+        # First submission month of each (table, course).
+        keys = pd.DataFrame(items.index.tolist(), columns=["table", "course", "month"])
+        built = keys.groupby(["table", "course"])["month"].min().value_counts()
+    kpis = pd.DataFrame({
+        "Curriculum Modules Built": built,
+        "Modules Revised": _measure(months, "revised"),
+        "Quality Checks Done": _measure(months, "checks"),
+        "Average QC Score (%)": _mean(months, "score"),
+        "Turnaround Time (Days)": _mean(months, "tat"),
+        "Content Feedback Items": _measure(months, "feedback"),
+        "Content Updated Based on Feedback": _measure(months, "acted"),
+        "Pending Requests": _measure(months, "pending"),
+    })
+    if kpis.empty:
+        return pd.DataFrame(columns=KPI_COLUMNS)
+    counts = [c for c in KPI_COLUMNS if c not in ("Month", "Average QC Score (%)", "Turnaround Time (Days)")]
+    kpis[counts] = kpis[counts].fillna(0).round().astype("int64")
+    kpis = kpis.sort_index(ascending=False)
+    kpis.index = pd.PeriodIndex(kpis.index, freq="M").to_timestamp()
+    return kpis.rename_axis("Month").reset_index()[KPI_COLUMNS]
+
+
+def _member_kpis():
+    members = _view("member", [DAILY_TASK_TABLE, TRAINING_TABLE, ERROR_LOG_TABLE])
+    if members.empty:
+        return pd.DataFrame(columns=MEMBER_KPI_COLUMNS)
+    kpis = pd.DataFrame({
+        "Tasks Logged": _measure(members, "tasks"),
+        "Tasks Completed": _measure(members, "tasks_done"),
+        "Task Hours": _measure(members, "task_hours"),
+        "Trainings": _measure(members, "trainings"),
+        "Training Hours": _measure(members, "training_hours"),
+        "Errors Logged": _measure(members, "errors"),
+    }).fillna(0)
+    counts = ["Tasks Logged", "Tasks Completed", "Trainings", "Errors Logged"]
+    kpis[counts] = kpis[counts].round().astype("int64")
+    return kpis.sort_index().rename_axis("Team Member").reset_index()[MEMBER_KPI_COLUMNS]
+
+
+def _course_kpis():
+    courses = _view("course", QC_TABLES + [FEEDBACK_TABLE])
+    if courses.empty:
+        return pd.DataFrame(columns=COURSE_KPI_COLUMNS)
+    kpis = pd.DataFrame({
+        "QC Entries": _measure(courses, "qc_entries").fillna(0).round().astype("int64"),
+        "Turnaround Time (Days)": _mean(courses, "tat"),
+        "Feedback Items": _measure(courses, "feedback").fillna(0).round().astype("int64"),
+        "Average Rating (1-5)": _mean(courses, "rating"),
+    })
+    return kpis.sort_index().rename_axis("Course Name").reset_index()[COURSE_KPI_COLUMNS]
+
+
+# ----------------- QC Turnaround -----------------
+# Days between the milestones every QC table records, per stage. Stages with a
+# missing or negative span are left out rather than counted as zero.
+TURNAROUND_STAGES = {
+    "QC 1": ("CONTENT SUBMITTED ON", "QC 1 FEEDBACK DATE"),
+    "Rework": ("QC 1 FEEDBACK DATE", "QC 1 CONTENT RECEIVED ON"),
+    "QC 2": ("QC 1 CONTENT RECEIVED ON", "QC 2 FEEDBACK DATE"),
+    "Cycle": ("CONTENT SUBMITTED ON", "QC 2 CONTENT RECEIVED ON"),
+}
+TURNAROUND_COLUMNS = [
+    "COURSE NAME", "QC REVIEWER", "CONTENT SUBMITTED ON", "QC 1 FEEDBACK DATE",
+    "QC 1 CONTENT RECEIVED ON", "QC 2 FEEDBACK DATE", "QC 2 CONTENT RECEIVED ON",
+]
+
+
+def _turnaround_days():
+    # All QC tables and stages as one long (course, reviewer, stage, days) frame.
+    # Dates and text are normalized per table first so the tables stack cleanly
+    # whatever dtypes their own data gave them.
+    frames = []
+    for file in QC_TABLES:
+        df = read_columns(file, TURNAROUND_COLUMNS)
+        frames.append(pd.DataFrame({
+            column: _dates(df, column) if column in QC_DATE_COLUMNS else _text(df[column])
+            for column in TURNAROUND_COLUMNS
+        }))
+    qc = pd.concat(frames, ignore_index=True)
+    course, reviewer = qc["COURSE NAME"], qc["QC REVIEWER"]
+    stages = [
+        pd.DataFrame({
+            "Course Name": course,
+            "QC Reviewer": reviewer,
+            "Stage": stage,
+            "Days": (_dates(qc, end) - _dates(qc, start)).dt.days.astype("float64"),
+        })
+        for stage, (start, end) in TURNAROUND_STAGES.items()
+    ]
+    days = pd.concat(stages, ignore_index=True)
+    return days[days["Days"] >= 0], qc.assign(**{"Course Name": course, "QC Reviewer": reviewer})
+
+
+def _distribution(days, qc, by):
+    days, qc = days[days[by] != ""], qc[qc[by] != ""]
+    columns = [by, "QC Entries"] + [f"{stage} {stat}" for stage in TURNAROUND_STAGES for stat in ("Median", "P90")]
+    if qc.empty:
+        return pd.DataFrame(columns=columns)
+    grouped = days.groupby([by, "Stage"])["Days"]
+    stats = pd.DataFrame({"Median": grouped.median(), "P90": grouped.quantile(0.9)}).unstack("Stage")
+    stats.columns = [f"{stage} {stat}" for stat, stage in stats.columns]
+    out = qc.groupby(by).size().rename("QC Entries").to_frame().join(stats)
+    return out.rename_axis(by).reset_index().reindex(columns=columns)
+
+
+def _turnaround():
+    days, qc = _turnaround_days()
+    return {"course": _distribution(days, qc, "Course Name"), "reviewer": _distribution(days, qc, "QC Reviewer")}
+
+
+def turnaround_stats():
+    # {"course": ..., "reviewer": ...}: QC entries and median/p90 days per stage,
+    # computed together in one pass over the QC tables.
+    return _memoized("turnaround", QC_TABLES, _turnaround)
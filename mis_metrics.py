@@ -0,0 +1,201 @@
+import contextlib
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ----------------- Registry -----------------
+# Process-wide counters, histograms and gauges in the Prometheus text format, so
+# storage latency, cache behaviour and app errors can be scraped and alerted on.
+# Every metric is created once per process: counter()/histogram()/gauge() return the
+# existing metric when the name is already registered, so a Streamlit script can
+# declare its metrics at the top and still rerun freely.
+# Gauges are read when scraped, from a callback returning {label values: value}.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_METRICS = {}
+_LOCK = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _sample(name, labelnames, key, value, extra=()):
+    pairs = list(zip(labelnames, key)) + list(extra)
+    labels = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}" if pairs else ""
+    return f"{name}{labels} {_format_value(value)}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.values = {}
+
+    def inc(self, value=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with _LOCK:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def totals(self):
+        # {label values: count}, copied.
+        with _LOCK:
+            return dict(self.values)
+
+    def samples(self):
+        return [_sample(self.name, self.labelnames, key, value) for key, value in sorted(self.totals().items())]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with _LOCK:
+            counts, total = self.values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value)
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with _LOCK:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        lines = []
+        for key, (counts, total) in values:
+            for bound, count in zip(self.buckets, counts):
+                lines.append(_sample(f"{self.name}_bucket", self.labelnames, key, count, [("le", _format_value(bound))]))
+            lines.append(_sample(f"{self.name}_sum", self.labelnames, key, total))
+            lines.append(_sample(f"{self.name}_count", self.labelnames, key, counts[-1]))
+        return lines
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help, labelnames=(), read=None):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.read = read
+
+    def samples(self):
+        values = self.read()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            _sample(self.name, self.labelnames, key if isinstance(key, tuple) else (key,), value)
+            for key, value in sorted(values.items())
+            if value is not None
+        ]
+
+
+def _register(cls, name, *args, **kwargs):
+    with _LOCK:
+        metric = _METRICS.get(name)
+        if metric is None:
+            metric = _METRICS[name] = cls(name, *args, **kwargs)
+    if not isinstance(metric, cls):
+        raise ValueError(f"{name} is already registered as a {metric.kind}")
+    return metric
+
+
+def counter(name, help, labelnames=()):
+    return _register(Counter, name, help, labelnames)
+
+
+def histogram(name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+    return _register(Histogram, name, help, labelnames, buckets)
+
+
+def gauge(name, help, labelnames=(), read=None):
+    # read() returns one value, or {label value(s): value} for labelled gauges.
+    return _register(Gauge, name, help, labelnames, read)
+
+
+def render():
+    # The text exposition of every metric. A gauge whose callback fails is left
+    # out rather than failing the whole scrape.
+    with _LOCK:
+        metrics = sorted(_METRICS.items())
+    lines = []
+    for name, metric in metrics:
+        try:
+            samples = metric.samples()
+        except Exception:
+            continue
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        lines += samples
+    return "\n".join(lines) + "\n"
+
+
+# ----------------- Exposition Endpoint -----------------
+# GET /metrics on a daemon thread next to the Streamlit server, started once per
+# process when MIS_METRICS_PORT is set (port 0 picks a free one, for local checks).
+# A second process on the same host finds the port taken and serves nothing.
+METRICS_HOST = os.environ.get("MIS_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = os.environ.get("MIS_METRICS_PORT")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_SERVER = None
+_SERVER_LOCK = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port=None, host=None):
+    # Returns the running server (its port is server.server_address[1]), or None
+    # when no port is configured or the port is already taken.
+    global _SERVER
+    port = METRICS_PORT if port is None else port
+    if port is None or port == "":
+        return None
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            try:
+                server = ThreadingHTTPServer((host or METRICS_HOST, int(port)), _MetricsHandler)
+            except OSError:
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="mis-metrics", daemon=True).start()
+            _SERVER = server
+    return _SERVER
@@ -0,0 +1,96 @@
+import collections
+import contextlib
+import cProfile
+import io
+import marshal
+import pstats
+import threading
+import time
+
+import pandas as pd
+
+from mis_metrics import gauge
+
+# ----------------- Timings -----------------
+# Rolling wall-clock timings per name (a helper like "read_page" or a page like
+# "page:Content QC"), shared by every session of the process. Only the last
+# TIMING_WINDOW calls of each name are kept, so the percentiles follow recent load.
+TIMING_WINDOW = 500
+
+_TIMINGS = collections.defaultdict(lambda: collections.deque(maxlen=TIMING_WINDOW))
+_TIMINGS_LOCK = threading.Lock()
+
+
+def record_timing(name, seconds):
+    with _TIMINGS_LOCK:
+        _TIMINGS[name].append(seconds)
+
+
+@contextlib.contextmanager
+def timed(name):
+    # Times the block, or the function it decorates, under name, including calls
+    # that raise.
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(name, time.perf_counter() - start)
+
+
+def timing_stats():
+    # One row per name: call count, p50/p95/max and the last call, in milliseconds.
+    with _TIMINGS_LOCK:
+        samples = {name: list(values) for name, values in _TIMINGS.items() if values}
+    columns = ["Name", "Calls", "p50 (ms)", "p95 (ms)", "Max (ms)", "Last (ms)"]
+    rows = []
+    for name, values in sorted(samples.items()):
+        ms = pd.Series(values) * 1000
+        rows.append((name, len(values), ms.quantile(0.5), ms.quantile(0.95), ms.max(), ms.iloc[-1]))
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _timing_quantiles():
+    stats = timing_stats()
+    return {
+        (name, quantile): ms / 1000
+        for name, p50, p95 in zip(stats["Name"], stats["p50 (ms)"], stats["p95 (ms)"])
+        for quantile, ms in (("0.5", p50), ("0.95", p95))
+    }
+
+
+gauge("mis_timing_seconds", "Rolling p50/p95 of the timed helpers and pages", ("name", "quantile"), _timing_quantiles)
+
+
+def reset_timings():
+    with _TIMINGS_LOCK:
+        _TIMINGS.clear()
+
+
+# ----------------- cProfile -----------------
+# A full trace of one call, for when the timings say which page is slow but not why.
+# cProfile only sees the calling thread, i.e. the one session's script run. Only one
+# profiler can run at a time, so a second request while one runs just skips it.
+PROFILE_LINES = 40
+
+_PROFILE_LOCK = threading.Lock()
+
+
+def profile_call(fn, *args, **kwargs):
+    # Returns (result, report, raw stats). The report is the top PROFILE_LINES
+    # functions by cumulative time; the raw stats load with pstats.Stats or snakeviz
+    # once written to a .prof file. Both are None when another profile is running.
+    if not _PROFILE_LOCK.acquire(blocking=False):
+        return fn(*args, **kwargs), None, None
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+    finally:
+        _PROFILE_LOCK.release()
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_LINES)
+    profiler.create_stats()
+    return result, report.getvalue(), marshal.dumps(profiler.stats)
@@ -0,0 +1,597 @@
+import os
+
+import pandas as pd
+
+# ----------------- Table Schemas -----------------
+# Column types per table, applied whenever a table is read. Columns not listed stay
+# free text. Kinds:
+#   "date"     ISO dates written by st.date_input -> datetime64
+#   "month"    "June 2025" style months            -> datetime64 (first of month)
+#   "float"    numbers                             -> float64
+#   "int"      whole numbers (sliders, scores)     -> Int64
+#   "category" short repeated labels               -> category
+#   [...]      categorical with a fixed domain; the listed values come first and
+#              any other value found in the data is kept after them
+DAILY_STATUS = ["Pending", "In Progress", "Completed"]
+ERROR_TYPES = ["Formatting", "Grammar", "Content", "Incorrect Data", "Other"]
+FEEDBACK_SOURCES = ["Trainer", "Student"]
+
+QC_DATE_COLUMNS = {
+    "CONTENT SUBMITTED ON": "date",
+    "UPDATED DATE": "date",
+    "QC 1 FEEDBACK DATE": "date",
+    "QC 1 CONTENT RECEIVED ON": "date",
+    "QC 2 FEEDBACK DATE": "date",
+    "QC 2 CONTENT RECEIVED ON": "date",
+}
+
+QC_SCHEMA = {**QC_DATE_COLUMNS, "QC REVIEWER": "category"}
+
+MIS_METRIC_COLUMNS = {
+    "Month": "month",
+    "Curriculum Modules Built": "float",
+    "Modules Revised": "float",
+    "Quality Checks Done": "float",
+    "Average QC Score (%)": "float",
+    "Turnaround Time (Days)": "float",
+    "Content Feedback Items": "float",
+    "Content Updated Based on Feedback": "float",
+    "Pending Requests": "float",
+}
+
+SCHEMAS = {
+    "content_team_daily_tasks.csv": {
+        "Date": "date",
+        "Team Member": "category",
+        "Time Spent (Hrs)": "float",
+        "Status": DAILY_STATUS,
+    },
+    "content_team_training_tracker.csv": {
+        "Date": "date",
+        "Team Member": "category",
+        "Duration (Hrs)": "float",
+    },
+    "content_team_audit_logs.csv": {
+        "Date": "date",
+        "Team Member": "category",
+        "Error Type": ERROR_TYPES,
+    },
+    "content_team_mis_kpis.csv": MIS_METRIC_COLUMNS,
+    "mis_template.csv": MIS_METRIC_COLUMNS,
+    "primary_content_audit.csv": {
+        "Category": "category",
+        "Last Updated": "date",
+        "Status": ["Outdated", "Active", "Archived"],
+        "Usage Analytics": ["Low", "Medium", "Very Low"],
+        "QC Score (/5)": "int",
+        "Audit Due Date": "date",
+        "Action Required": ["Revise", "Keep Active", "Archive"],
+        "Remarks": ["Tools outdated", "Aligns with curriculum", "Replaced by new module"],
+        "Final Decision": "date",
+    },
+    "audit_calendar.csv": {
+        "Month": "month",
+        "Deadline": "date",
+        "Review Meeting Date": "date",
+        "Progress (%)": "int",
+        "Status": ["Planned", "In Progress", "Completed", "Delayed"],
+    },
+    "feedback_summary.csv": {
+        "Source": FEEDBACK_SOURCES,
+        "Rating": "int",
+        "Feedback Source": FEEDBACK_SOURCES,
+        "Rating (1-5)": "int",
+        "Date Received": "date",
+        "Follow-up Date": "date",
+    },
+    "lesson_plan_qc.csv": QC_SCHEMA,
+    "textbook_qc.csv": QC_SCHEMA,
+    "worksheet_qc.csv": QC_SCHEMA,
+    "kpi_page.csv": {
+        "KPI": "category",
+        "Target": "category",
+        "Owner": ["Content Lead", "QC Team", "Content Coordinator", "Innovation Officer"],
+    },
+    "content_team_kpis.csv": {
+        "Content Creation": "category",
+        "Content Quality & Improvement": "category",
+        "Quality & Accuracy": "category",
+    },
+}
+
+# ----------------- Table Layouts -----------------
+# Column layouts per table, oldest first. The last layout is canonical: it is what
+# ContentMISFinals.py writes and what migrate_tables() rewrites older files into. Each
+# later layout says how columns of the one before it carry over:
+#   "rename"  old column -> new column
+#   "fold"    dropped column -> text column its values are appended to, labelled
+# Canonical columns nothing maps onto start out empty.
+QC_TRACKING_COLUMNS = [
+    "QC 1 FEEDBACK DATE", "QC 1 CONTENT RECEIVED ON",
+    "QC 2 FEEDBACK DATE", "QC 2 CONTENT RECEIVED ON", "REMARKS",
+]
+QC_REVIEW_COLUMNS = ["QC REVIEWER"] + QC_TRACKING_COLUMNS
+
+# Leading columns of the QC tables, up to the QC tracking columns.
+LESSON_PLAN_QC_CRITERIA = [
+    "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
+    "CURRICULUM ALIGNMENT", "CONCEPT CLARITY", "LANGUAGE & GRAMMAR",
+    "INNOVATION & ENGAGEMENT", "ACTIVITY & EXPERIMENT QUALITY",
+    "VISUALS & DIAGRAMS", "ASSESSMENT INTEGRATION", "FLOW OF CONTENT",
+]
+TEXTBOOK_QC_CRITERIA = [
+    "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
+    "CURRICULUM ALIGNMENT", "CONCEPT ACCURACY", "LANGUAGE & GRAMMAR",
+    "STRUCTURE & ORGANIZATION", "ILLUSTRATIONS & VISUALS",
+    "EXERCISE & ASSESSMENT", "INNOVATION & ENGAGEMENT",
+]
+WORKSHEET_QC_CRITERIA = [
+    "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "VERSION", "UPDATED DATE",
+    "CURRICULUM ALIGNMENT", "CONCEPT ACCURACY", "LANGUAGE",
+    "STRUCTURE OF OPTIONS", "DISTRACTOR QUALITY", "VARIETY & COVERAGE",
+    "LANGUAGE & GRAMMAR", "FORMATTING & NUMBERING", "ANSWER KEY ACCURACY",
+]
+
+MIS_COLUMNS = [
+    "S.No", "Month", "Curriculum Modules Built", "Modules Revised", "Quality Checks Done",
+    "Average QC Score (%)", "Turnaround Time (Days)", "Content Feedback Items",
+    "Content Updated Based on Feedback", "Pending Requests", "Notes/Challenges",
+]
+
+LAYOUTS = {
+    "content_team_daily_tasks.csv": [
+        {"columns": ["S.No", "Date", "Team Member", "Task Description", "Time Spent (Hrs)", "Status"]},
+    ],
+    "content_team_training_tracker.csv": [
+        {"columns": ["S.No", "Date", "Team Member", "Training Name", "Duration (Hrs)", "Feedback"]},
+    ],
+    "content_team_audit_logs.csv": [
+        {"columns": [
+            "S.No", "Date", "Team Member", "Document/Task", "Error Type", "Correction Action", "Remarks",
+        ]},
+    ],
+    "content_team_mis_kpis.csv": [{"columns": MIS_COLUMNS}],
+    "mis_template.csv": [{"columns": MIS_COLUMNS}],
+    "primary_content_audit.csv": [
+        {"columns": [
+            "S.No", "Course Name", "Category", "Last Updated", "Status", "Usage Analytics",
+            "QC Score (/5)", "Audit Due Date", "Action Required", "Remarks",
+            "Assigned To", "Reviewed By", "Final Decision",
+        ]},
+    ],
+    "audit_calendar.csv": [
+        {"columns": [
+            "S.No", "Month", "Courses for Audit", "Auditor", "Deadline", "Review Meeting Date", "Comments",
+        ]},
+        {
+            "columns": [
+                "S.No", "Month", "Courses for Audit", "Assigned To", "Deadline",
+                "Progress (%)", "Status", "Notes",
+            ],
+            "rename": {"Auditor": "Assigned To", "Comments": "Notes"},
+            "fold": {"Review Meeting Date": "Notes"},
+        },
+    ],
+    "feedback_summary.csv": [
+        {"columns": [
+            "S.No", "Course Name", "Source", "Rating", "Issue Reported", "Suggestions", "Date Received",
+        ]},
+        {
+            "columns": [
+                "S.No", "Course Name", "Feedback Source", "Rating (1-5)", "Key Suggestions",
+                "Action Taken", "Date Received", "Follow-up Date",
+            ],
+            "rename": {"Source": "Feedback Source", "Rating": "Rating (1-5)", "Suggestions": "Key Suggestions"},
+            "fold": {"Issue Reported": "Key Suggestions"},
+        },
+    ],
+    "lesson_plan_qc.csv": [
+        {"columns": LESSON_PLAN_QC_CRITERIA + QC_TRACKING_COLUMNS},
+        {"columns": LESSON_PLAN_QC_CRITERIA + QC_REVIEW_COLUMNS},
+    ],
+    "textbook_qc.csv": [
+        {"columns": [
+            "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "CURRICULUM ALIGNMENT",
+            "CONCEPT CLARITY AND ACCURACY", "LANGUAGE", "STRUCTURE AND ORGANIZATION",
+            "ILLUSTRATION AND VISUALS", "EXERCISE AND ASSESSMENT", "PRESENTATION AND FORMALITY",
+        ] + QC_TRACKING_COLUMNS},
+        {
+            "columns": TEXTBOOK_QC_CRITERIA + QC_TRACKING_COLUMNS,
+            "rename": {
+                "CONCEPT CLARITY AND ACCURACY": "CONCEPT ACCURACY",
+                "LANGUAGE": "LANGUAGE & GRAMMAR",
+                "STRUCTURE AND ORGANIZATION": "STRUCTURE & ORGANIZATION",
+                "ILLUSTRATION AND VISUALS": "ILLUSTRATIONS & VISUALS",
+                "EXERCISE AND ASSESSMENT": "EXERCISE & ASSESSMENT",
+            },
+            "fold": {"PRESENTATION AND FORMALITY": "REMARKS"},
+        },
+        {"columns": TEXTBOOK_QC_CRITERIA + QC_REVIEW_COLUMNS},
+    ],
+    "worksheet_qc.csv": [
+        {"columns": [
+            "S.No", "COURSE NAME", "CONTENT SUBMITTED ON", "CURRICULUM ALIGNMENT", "CONCEPT ACCURACY",
+            "LANGUAGE", "STRUCTURE OF OPTIONS", "DISTRACTOR QUALITY", "VARIETY & COVERAGE",
+            "LANGUAGE & GRAMMAR", "FORMATTING & NUMBERING", "ANSWER KEY ACCURACY",
+        ] + QC_TRACKING_COLUMNS},
+        {"columns": WORKSHEET_QC_CRITERIA + QC_TRACKING_COLUMNS},
+        {"columns": WORKSHEET_QC_CRITERIA + QC_REVIEW_COLUMNS},
+    ],
+    "kpi_page.csv": [
+        {"columns": ["S.No", "KPI", "Target", "Owner"]},
+    ],
+    "content_team_kpis.csv": [
+        {"columns": ["S.No", "Content Creation", "Content Quality & Improvement", "Quality & Accuracy"]},
+    ],
+}
+
+# ----------------- Record Filters -----------------
+# The columns each record view can be filtered on, by role: "course", "member" and
+# "status" pick one value, "date" takes a range.
+QC_FILTERS = {"course": "COURSE NAME", "member": "QC REVIEWER", "date": "CONTENT SUBMITTED ON"}
+
+FILTERS = {
+    "content_team_daily_tasks.csv": {"member": "Team Member", "status": "Status", "date": "Date"},
+    "content_team_training_tracker.csv": {"member": "Team Member", "date": "Date"},
+    "content_team_audit_logs.csv": {"member": "Team Member", "status": "Error Type", "date": "Date"},
+    "primary_content_audit.csv": {
+        "course": "Course Name", "member": "Assigned To", "status": "Status", "date": "Audit Due Date",
+    },
+    "audit_calendar.csv": {
+        "course": "Courses for Audit", "member": "Assigned To", "status": "Status", "date": "Deadline",
+    },
+    "feedback_summary.csv": {"course": "Course Name", "status": "Feedback Source", "date": "Date Received"},
+    "lesson_plan_qc.csv": QC_FILTERS,
+    "textbook_qc.csv": QC_FILTERS,
+    "worksheet_qc.csv": QC_FILTERS,
+    "kpi_page.csv": {"member": "Owner"},
+}
+
+# ----------------- Table Specs -----------------
+# What a page needs to render a table: one renderer builds the entry form, batch
+# grid, records, export and delete section of every table from this spec, and every
+# write goes through validate_rows and append_rows. A form field's widget follows
+# the column's schema kind (dates, months, numbers, a select over a fixed domain)
+# unless "widgets" names another; other columns are one-line text inputs. Widgets:
+#   "text", "area", "wide" (full-width text area below the grid), "date", "month",
+#   "number", "select", ("slider", min, max, default)
+# Other keys: "title" (subheader), "records" (heading above the records),
+# "form_columns" (grid width), "labels" (column -> field label), "required",
+# "submit"/"saved" (button and success text), "export" (download file name).
+QC_SPEC = {
+    "form_columns": 3,
+    "required": ["COURSE NAME"],
+    "widgets": {"REMARKS": "wide"},
+}
+
+TABLE_SPECS = {
+    "content_team_daily_tasks.csv": {
+        "records": "🗂️ Records",
+        "form_columns": 2,
+        "widgets": {"Task Description": "wide"},
+        "required": ["Team Member", "Task Description"],
+        "submit": "Submit",
+        "saved": "✅ Task logged!",
+        "export": "daily_tasks.csv",
+    },
+    "content_team_training_tracker.csv": {
+        "records": "📈 Records",
+        "widgets": {"Feedback": "area"},
+        "required": ["Team Member", "Training Name"],
+        "submit": "Submit",
+        "saved": "✅ Training record saved!",
+        "export": "training_tracker.csv",
+    },
+    "content_team_audit_logs.csv": {
+        "records": "🔍 Audit Records",
+        "widgets": {"Correction Action": "area", "Remarks": "area"},
+        "labels": {"Correction Action": "Correction Action Taken"},
+        "required": ["Team Member", "Document/Task"],
+        "submit": "Submit",
+        "saved": "✅ Audit log saved!",
+        "export": "audit_logs.csv",
+    },
+    "primary_content_audit.csv": {
+        "title": "📌 Primary Content Audit Tracker",
+        "form_columns": 3,
+        "widgets": {"QC Score (/5)": ("slider", 1, 5, 3)},
+        "required": ["Course Name"],
+        "submit": "Submit Audit Entry",
+        "saved": "✅ Audit Entry Added Successfully",
+        "export": "primary_audit_tracker.csv",
+    },
+    "audit_calendar.csv": {
+        "title": "📆 Monthly Audit Calendar",
+        "form_columns": 2,
+        "widgets": {"Courses for Audit": "area", "Progress (%)": ("slider", 0, 100, 0), "Notes": "wide"},
+        "labels": {"Courses for Audit": "Courses for Audit (comma-separated)"},
+        "required": ["Courses for Audit"],
+        "submit": "Submit Calendar Entry",
+        "saved": "✅ Calendar Entry Added",
+    },
+    "feedback_summary.csv": {
+        "title": "📝 Feedback Summary",
+        "form_columns": 2,
+        "widgets": {"Rating (1-5)": ("slider", 1, 5, 3), "Key Suggestions": "wide", "Action Taken": "wide"},
+        "required": ["Course Name"],
+        "submit": "Submit Feedback",
+        "saved": "✅ Feedback Added",
+    },
+    "lesson_plan_qc.csv": {
+        **QC_SPEC,
+        "title": "📄 Main Content QC (Lesson Plan)",
+        "widgets": {**QC_SPEC["widgets"], **{c: "area" for c in LESSON_PLAN_QC_CRITERIA[5:]}},
+        "submit": "Submit Lesson Plan QC",
+        "saved": "✅ Lesson Plan QC Entry Saved!",
+    },
+    "textbook_qc.csv": {
+        **QC_SPEC,
+        "title": "📖 Textbook QC",
+        "widgets": {**QC_SPEC["widgets"], **{c: "area" for c in TEXTBOOK_QC_CRITERIA[5:]}},
+        "submit": "Submit Textbook QC",
+        "saved": "✅ Textbook QC Entry Saved!",
+    },
+    "worksheet_qc.csv": {
+        **QC_SPEC,
+        "title": "📝 Worksheet QC",
+        "widgets": {**QC_SPEC["widgets"], **{c: "area" for c in WORKSHEET_QC_CRITERIA[5:]}},
+        "submit": "Submit Worksheet QC",
+        "saved": "✅ Worksheet QC Entry Saved!",
+    },
+}
+
+_KIND_WIDGETS = {"date": "date", "month": "month", "float": "number", "int": "number"}
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+
+def table_schema(file):
+    return SCHEMAS.get(os.path.basename(file), {})
+
+
+def date_columns(file):
+    return {c: kind for c, kind in table_schema(file).items() if kind in ("date", "month")}
+
+
+def table_columns(file):
+    layouts = LAYOUTS.get(os.path.basename(file))
+    return list(layouts[-1]["columns"]) if layouts else []
+
+
+def filter_columns(file):
+    return FILTERS.get(os.path.basename(file), {})
+
+
+def table_spec(file):
+    return TABLE_SPECS.get(os.path.basename(file), {})
+
+
+def form_fields(file):
+    # (column, widget, label) for each field of the table's entry form, in order.
+    spec, schema = table_spec(file), table_schema(file)
+    fields = []
+    for column in table_columns(file):
+        if column == "S.No":
+            continue
+        kind = schema.get(column)
+        widget = spec.get("widgets", {}).get(column) or (
+            "select" if isinstance(kind, list) else _KIND_WIDGETS.get(kind, "text")
+        )
+        fields.append((column, widget, spec.get("labels", {}).get(column, column)))
+    return fields
+
+
+def layout_version(file, header):
+    # 1-based version of the layout the header matches exactly, None for a header
+    # no layout describes (e.g. one widened by rows from a different layout).
+    for version, layout in enumerate(LAYOUTS.get(os.path.basename(file), []), 1):
+        if list(header) == layout["columns"]:
+            return version
+    return None
+
+
+def _legacy_columns(file):
+    layouts = LAYOUTS.get(os.path.basename(file), [])
+    canonical = set(layouts[-1]["columns"]) if layouts else set()
+    return {c for layout in layouts[:-1] for c in layout["columns"] if c not in canonical}
+
+
+def needs_migration(file, header):
+    # Columns no layout knows about are left where they are and do not count.
+    canonical = table_columns(file)
+    if not canonical:
+        return False
+    legacy = _legacy_columns(file)
+    return [c for c in header if c in canonical] != canonical or any(c in legacy for c in header)
+
+
+def _join_text(first, second):
+    both = first.notna() & second.notna()
+    out = first.where(first.notna(), second).astype(object)
+    out[both] = first[both].astype(str) + "\n" + second[both].astype(str)
+    return out
+
+
+def migrate_frame(df, file):
+    # Carry a table in any older (or mixed) layout over to the canonical one. Steps
+    # run oldest first and only touch the columns actually present, so a header
+    # widened by appends from two layouts merges cleanly into one set of columns.
+    layouts = LAYOUTS.get(os.path.basename(file), [])
+    if not layouts:
+        return df
+    df = df.copy()
+    start = layout_version(file, df.columns) or 1
+    for layout in layouts[start:]:
+        for old, new in layout.get("rename", {}).items():
+            if old in df.columns:
+                df[new] = df[new].where(df[new].notna(), df[old]) if new in df.columns else df[old]
+                df = df.drop(columns=old)
+        for old, target in layout.get("fold", {}).items():
+            if old in df.columns:
+                note = (old + ": " + df[old].astype(str)).where(df[old].notna())
+                df[target] = _join_text(df[target], note) if target in df.columns else note
+                df = df.drop(columns=old)
+    canonical = layouts[-1]["columns"]
+    return df.reindex(columns=canonical + [c for c in df.columns if c not in canonical])
+
+
+def read_csv_options(file, header, typed=True):
+    # Options for pd.read_csv, limited to the columns the file has. Free-text columns
+    # are read as their stored text ("007" stays "007", "1.10" stays "1.10") and only
+    # blank cells are missing; S.No is left to pandas. Without typed, the schema's
+    # columns are read as text too, for apply_schema to coerce.
+    schema = table_schema(file)
+    dtype = {column: "str" for column in header if column != "S.No" and column not in schema}
+    dates = []
+    for column, kind in schema.items():
+        if column not in header:
+            continue
+        if not typed:
+            dtype[column] = "str"
+        elif kind == "date":
+            dates.append(column)
+        elif kind == "float":
+            dtype[column] = "float64"
+        elif kind == "int":
+            dtype[column] = "Int64"
+        elif kind != "month":
+            dtype[column] = "category"
+        else:
+            dtype[column] = "str"
+    return {
+        "dtype": dtype,
+        "parse_dates": dates,
+        "date_format": "ISO8601",
+        "keep_default_na": False,
+        "na_values": [""],
+    }
+
+
+def _to_number(values):
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    # Free-typed entries such as "10 Days" or "92%" keep their leading number.
+    numbers = values.astype("string").str.extract(_NUMBER, expand=False)
+    return pd.to_numeric(numbers, errors="coerce").astype("float64")
+
+
+def apply_schema(df, file):
+    # Idempotent: columns already read with the right dtype are left alone, anything
+    # else (SQLite reads, rows that failed the fast typed parse) is coerced here.
+    for column, kind in table_schema(file).items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if kind in ("date", "month"):
+            if not pd.api.types.is_datetime64_any_dtype(values):
+                df[column] = pd.to_datetime(
+                    values, errors="coerce", format="ISO8601" if kind == "date" else "%B %Y"
+                )
+        elif kind == "float":
+            if values.dtype != "float64":
+                df[column] = _to_number(values)
+        elif kind == "int":
+            if values.dtype != "Int64":
+                numbers = _to_number(values)
+                whole = numbers.dropna()
+                df[column] = numbers.astype("Int64") if (whole == whole.round()).all() else numbers
+        else:
+            domain = kind if isinstance(kind, list) else []
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype("category")
+            categories = list(values.cat.categories)
+            wanted = domain + [c for c in categories if c not in domain]
+            if categories != wanted:
+                values = values.cat.set_categories(wanted)
+            df[column] = values
+    return df
+
+
+def concat_rows(df, rows):
+    # pd.concat turns categoricals with differing categories into object columns;
+    # widen the category set instead so appended rows keep the table's dtypes.
+    # Blank columns of the new rows are left to the concat to fill, so they do not
+    # take part in choosing the result's dtypes.
+    rows = rows.dropna(axis=1, how="all")
+    out = pd.concat([df, rows], ignore_index=True)
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and out[column].dtype != dtype and column in rows:
+            extra = [v for v in pd.unique(rows[column].dropna()) if v not in dtype.categories]
+            out[column] = out[column].astype(pd.CategoricalDtype(list(dtype.categories) + extra))
+    return out
+
+
+# ----------------- Import Validation -----------------
+# Uploaded rows are checked a column at a time against the same kinds apply_schema
+# reads, so a bad cell is reported instead of being read back as blank, and the
+# values a fixed-domain column may take are the ones its form offers. Valid rows
+# come back written the way the forms write them (ISO dates, "June 2025" months,
+# plain numbers). S.No is always allocated by the write, never imported.
+IMPORT_ERROR_COLUMNS = ["Row", "Column", "Value", "Error"]
+
+
+def _cell_errors(text, bad, column, message):
+    return pd.DataFrame({"Row": bad.index[bad], "Column": column, "Value": text[bad], "Error": message})
+
+
+def validate_rows(df, file):
+    # Returns (valid records for append_rows, errors frame with spreadsheet row
+    # numbers, uploaded columns the table does not have). A header lacking a required
+    # column, or every column of the table, is reported against row 1 and no rows
+    # are checked: each one would fail the same way.
+    schema = table_schema(file)
+    columns = [c for c in table_columns(file) if c != "S.No"]
+    unknown = [c for c in df.columns if c not in columns and c != "S.No"]
+    known = [c for c in columns if c in df.columns]
+    required = table_spec(file).get("required", [])
+    absent = [c for c in required if c not in known]
+    if absent or not known:
+        errors = pd.DataFrame({
+            "Row": 1,
+            "Column": absent or columns,
+            "Value": "",
+            "Error": "required column missing from the header" if absent else "no column of this table",
+        })
+        return [], errors, unknown
+    text = df[known].astype("string").apply(lambda values: values.str.strip())
+    text.index = pd.RangeIndex(2, len(df) + 2)  # row 1 is the header
+    blank = text.isna() | (text == "")
+    text = text.mask(blank)
+    empty = blank.all(axis=1)
+    out = pd.DataFrame(index=text.index)
+    errors = []
+    for column in known:
+        values, kind, missing = text[column], schema.get(column), blank[column]
+        if kind == "date":
+            parsed = pd.to_datetime(values, errors="coerce", format="ISO8601")
+            out[column], bad, message = parsed.dt.strftime("%Y-%m-%d"), parsed.isna(), "not a YYYY-MM-DD date"
+        elif kind == "month":
+            parsed = pd.to_datetime(values, errors="coerce", format="%B %Y").fillna(
+                pd.to_datetime(values, errors="coerce", format="ISO8601")
+            )
+            out[column], bad, message = parsed.dt.strftime("%B %Y"), parsed.isna(), "not a month like June 2025"
+        elif kind in ("float", "int"):
+            numbers = _to_number(values)
+            bad, message = numbers.isna(), "not a number"
+            if kind == "int":
+                bad |= numbers != numbers.round()
+                message = "not a whole number"
+                numbers = numbers.round().astype("Int64")
+            out[column] = numbers
+        elif isinstance(kind, list):
+            out[column], bad, message = values, ~values.isin(kind), "not one of: " + ", ".join(kind)
+        else:
+            out[column], bad = values, pd.Series(False, index=values.index)
+        bad = bad.fillna(True) & ~missing
+        if bad.any():
+            errors.append(_cell_errors(values, bad, column, message))
+    for column in required:
+        missing = blank[column] & ~empty
+        if missing.any():
+            errors.append(_cell_errors(pd.Series("", index=text.index), missing, column, "required"))
+    errors = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=IMPORT_ERROR_COLUMNS)
+    keep = ~empty & ~out.index.isin(errors["Row"])
+    out = out[keep].astype(object)
+    records = out.where(out.notna(), None).to_dict("records")
+    return records, errors.sort_values(["Row"], kind="stable", ignore_index=True), unknown
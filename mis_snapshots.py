@@ -0,0 +1,189 @@
+import json
+import os
+import tempfile
+import uuid
+
+import pandas as pd
+
+from mis_schema import apply_schema
+from mis_storage import add_write_hook, cached_table, file_lock, get_storage, read_table
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # without pyarrow, read_columns slices the parsed CSV table
+    pa = pq = None
+
+# ----------------- Parquet Snapshots -----------------
+# A columnar copy of each CSV table for analytical reads, so a view that aggregates
+# three columns reads three columns instead of re-parsing the whole CSV. The CSV stays
+# the source of truth and the editable/exported format; a snapshot is only trusted
+# while its recorded table version matches the CSV's.
+#
+# Layout: SNAPSHOT_DIR/<table>.csv/ holds a base part, one small part per appended
+# row and manifest.json ({"format", "version", "parts", "deleted"}). Writes made
+# through mis_storage extend the snapshot in place; any other change (a write from an
+# older process, a hand edit, a layout change) makes it stale and it is rebuilt on
+# the next read. Once SNAPSHOT_MAX_PARTS parts pile up they are merged into one.
+# SNAPSHOT_FORMAT is bumped whenever parts are written differently; snapshots of an
+# older format are rebuilt. Format 2 keeps free-text columns as their stored text.
+SNAPSHOT_DIR = os.environ.get("MIS_SNAPSHOT_DIR", ".mis_snapshots")
+SNAPSHOT_MAX_PARTS = 64
+SNAPSHOT_FORMAT = 2
+
+
+def _snapshot_dir(file):
+    return os.path.join(SNAPSHOT_DIR, os.path.basename(file))
+
+
+def _manifest_path(file):
+    return os.path.join(_snapshot_dir(file), "manifest.json")
+
+
+def _version_key(version):
+    # CSV versions are nested tuples; compare them in their JSON form.
+    return json.loads(json.dumps(version))
+
+
+def _load_manifest(file):
+    try:
+        with open(_manifest_path(file), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == SNAPSHOT_FORMAT else None
+
+
+def _save_manifest(file, manifest):
+    fd, tmp = tempfile.mkstemp(dir=_snapshot_dir(file), suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _manifest_path(file))
+
+
+def _drop_manifest(file):
+    try:
+        os.remove(_manifest_path(file))
+    except FileNotFoundError:
+        pass
+
+
+def _remove_parts(file, keep):
+    directory = _snapshot_dir(file)
+    for name in os.listdir(directory):
+        if name.endswith(".parquet") and name not in keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def _write_part(file, df, schema=None):
+    # Text and categorical columns are stored as plain strings; read_columns puts the
+    # schema's dtypes back, so parts written at different times always line up.
+    df = df.copy()
+    for column in df.columns:
+        if df[column].dtype == object or isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("string")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if schema is not None:
+        # An appended row has no type for a column left blank (it reads as a float);
+        # cast it to the base part's schema.
+        table = table.select(schema.names).cast(schema.remove_metadata())
+    name = f"part-{uuid.uuid4().hex}.parquet"
+    path = os.path.join(_snapshot_dir(file), name)
+    pq.write_table(table, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return name
+
+
+def _read_parts(file, manifest, columns=None):
+    directory = _snapshot_dir(file)
+    paths = [os.path.join(directory, name) for name in manifest["parts"]]
+    names = pq.read_schema(paths[0]).names
+    wanted = names if columns is None else [c for c in dict.fromkeys(["S.No"] + list(columns)) if c in names]
+    table = pa.concat_tables([pq.read_table(path, columns=wanted) for path in paths])
+    df = table.to_pandas(ignore_metadata=True)
+    if manifest["deleted"]:
+        df = df[~df["S.No"].isin(manifest["deleted"])].reset_index(drop=True)
+    return apply_schema(df, file)
+
+
+def write_snapshot(file):
+    # Full rebuild from the current table, skipped when a write lands during the
+    # read: its hook would otherwise add the same row to the snapshot a second time.
+    os.makedirs(_snapshot_dir(file), exist_ok=True)
+    with file_lock(_manifest_path(file)):
+        version = get_storage().version(file)
+        df = read_table(file, [])
+        if get_storage().version(file) != version:
+            return
+        name = _write_part(file, df)
+        _save_manifest(file, {"format": SNAPSHOT_FORMAT, "version": _version_key(version), "parts": [name], "deleted": []})
+        _remove_parts(file, {name})
+
+
+def _merge_parts(file, manifest):
+    with file_lock(_manifest_path(file)):
+        if _load_manifest(file) != manifest:
+            return
+        name = _write_part(file, _read_parts(file, manifest))
+        _save_manifest(file, {**manifest, "parts": [name], "deleted": []})
+        _remove_parts(file, {name})
+
+
+def read_columns(file, columns):
+    # The given columns of a table, typed and ordered like read_table(file)[columns].
+    storage = get_storage()
+    df = cached_table(file)
+    if df is not None:
+        return df.reindex(columns=columns)
+    if storage.name == "sqlite":
+        return storage.load_columns(file, columns)
+    version = storage.version(file)
+    if version is None:
+        return pd.DataFrame(columns=columns)
+    if pq is None:
+        return read_table(file, columns).reindex(columns=columns)
+    manifest = _load_manifest(file)
+    if manifest is None or manifest["version"] != _version_key(version):
+        write_snapshot(file)
+        return read_table(file, columns).reindex(columns=columns)
+    try:
+        df = _read_parts(file, manifest, columns)
+    except (OSError, pa.ArrowException):
+        # Parts merged away under us by another session; the table is authoritative.
+        return read_table(file, columns).reindex(columns=columns)
+    if len(manifest["parts"]) > SNAPSHOT_MAX_PARTS:
+        _merge_parts(file, manifest)
+    return df.reindex(columns=columns)
+
+
+def _on_write(event, file, before, after, payload):
+    if pq is None or get_storage().name != "csv" or not os.path.isfile(_manifest_path(file)):
+        return
+    try:
+        with file_lock(_manifest_path(file)):
+            manifest = _load_manifest(file)
+            if manifest is None:
+                return
+            if (
+                before is None
+                or manifest["version"] != _version_key(before)
+                or (event == "append" and payload is None)
+            ):
+                _drop_manifest(file)
+                return
+            if event == "append":
+                base = os.path.join(_snapshot_dir(file), manifest["parts"][0])
+                manifest["parts"].append(_write_part(file, payload, pq.read_schema(base)))
+            elif event == "delete":
+                manifest["deleted"].append(int(payload["S.No"].iloc[0]))
+            manifest["version"] = _version_key(after)
+            _save_manifest(file, manifest)
+    except (OSError, ValueError, TypeError, pa.ArrowException):
+        # The snapshot is derived data: drop it and let the next read rebuild it.
+        _drop_manifest(file)
+
+
+add_write_hook(_on_write)
@@ -0,0 +1,1291 @@
+import argparse
+import collections
+import contextlib
+import csv
+import glob
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from mis_metrics import counter, gauge, histogram
+from mis_schema import LAYOUTS, apply_schema, concat_rows, migrate_frame, needs_migration, read_csv_options
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locks only
+    fcntl = None
+
+try:
+    import openpyxl
+except ImportError:  # XLSX export is offered only when openpyxl is installed
+    openpyxl = None
+
+# Which backend the apps talk to. The CSV file names used across the pages stay the
+# table identifiers either way; the SQLite backend maps "lesson_plan_qc.csv" to a
+# "lesson_plan_qc" table inside MIS_SQLITE_PATH.
+STORAGE_BACKEND = os.environ.get("MIS_STORAGE", "csv")
+SQLITE_PATH = os.environ.get("MIS_SQLITE_PATH", "content_mis.db")
+
+
+def _stat_key(file):
+    stat = os.stat(file)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _format_value(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+def _csv_line(values):
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=os.linesep).writerow(values)
+    return buffer.getvalue()
+
+
+def _csv_lines(header, records):
+    return "".join(_csv_line([_format_value(data.get(c)) for c in header]) for data in records)
+
+
+def _number_rows(records, first):
+    # Allocates consecutive S.No values to a batch, in place.
+    for offset, data in enumerate(records):
+        data["S.No"] = first + offset
+    return [data["S.No"] for data in records]
+
+
+def _ends_with_newline(f):
+    f.seek(0, os.SEEK_END)
+    if f.tell() == 0:
+        return True
+    f.seek(-1, os.SEEK_END)
+    return f.read(1) == b"\n"
+
+
+# ----------------- Locking -----------------
+# Every writer takes the table's own lock, so sessions writing different tables never
+# wait on each other. Within the process a per-file threading lock orders the script
+# threads; across processes an advisory flock on "<file>.lock" does the same.
+_THREAD_LOCKS = collections.defaultdict(threading.Lock)
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+# Recent lock waits as (table, seconds), newest last.
+LOCK_WAITS = collections.deque(maxlen=1000)
+_LOCK_WAIT_SECONDS = histogram("mis_lock_wait_seconds", "Time spent waiting for a table lock", ("table",))
+
+
+def _record_lock_wait(file, seconds):
+    LOCK_WAITS.append((file, seconds))
+    _LOCK_WAIT_SECONDS.observe(seconds, table=os.path.basename(file))
+
+
+def lock_wait_stats():
+    waits = collections.defaultdict(list)
+    for file, seconds in LOCK_WAITS:
+        waits[file].append(seconds)
+    return {
+        file: {
+            "count": len(values),
+            "mean_ms": 1000 * sum(values) / len(values),
+            "p95_ms": 1000 * sorted(values)[int(0.95 * (len(values) - 1))],
+            "max_ms": 1000 * max(values),
+        }
+        for file, values in waits.items()
+    }
+
+
+@contextlib.contextmanager
+def file_lock(file):
+    with _THREAD_LOCKS_GUARD:
+        thread_lock = _THREAD_LOCKS[os.path.abspath(file)]
+    start = time.perf_counter()
+    with thread_lock:
+        if fcntl is None:
+            _record_lock_wait(file, time.perf_counter() - start)
+            yield
+            return
+        with open(file + ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            _record_lock_wait(file, time.perf_counter() - start)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+# mkstemp creates its file as 0600 and os.replace keeps that mode, so a replaced
+# file takes the mode of the one it replaces, or the usual 0666 & ~umask when new.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _match_mode(tmp, target):
+    try:
+        mode = os.stat(target).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp, mode)
+
+
+def atomic_write_csv(df, file):
+    # Readers see either the old file or the complete new one, never a half-written
+    # table: write a sibling temp file, fsync it, then rename it over the original.
+    directory = os.path.dirname(os.path.abspath(file))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(file) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            df.to_csv(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        _match_mode(tmp, file)
+        os.replace(tmp, file)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def _read_text(file, **options):
+    # The table exactly as stored: every cell as its text and blanks as missing, so
+    # a rewrite puts back the same text ("1.10" stays "1.10", "007" stays "007").
+    return pd.read_csv(file, dtype=str, keep_default_na=False, na_values=[""], **options)
+
+
+def _read_typed(file, source):
+    # The table's rows typed by its schema; source() opens the CSV text to parse, so
+    # the whole file and freshly appended lines go through the same read.
+    header = pd.read_csv(source(), nrows=0).columns
+    try:
+        df = pd.read_csv(source(), **read_csv_options(file, header))
+    except (ValueError, TypeError):
+        # A hand-edited value that does not fit the declared dtype: read as text
+        # and let apply_schema coerce what it can.
+        df = pd.read_csv(source(), **read_csv_options(file, header, typed=False))
+    return apply_schema(df, file)
+
+
+def _apply_filters(df, filters):
+    for column, value in (filters or {}).items():
+        df = df[df[column] == value]
+    return df
+
+
+# ----------------- CSV Backend -----------------
+# Deleting a row appends its S.No to a tombstone log ("<file>.deleted") instead of
+# rewriting the table, and S.No values are never renumbered or reused, so an entry
+# quoted in remarks keeps pointing at the same row. Compaction drops tombstoned rows
+# from the CSV once enough of them pile up.
+COMPACT_MIN_TOMBSTONES = 50
+
+
+def _tombstone_file(file):
+    return file + ".deleted"
+
+
+# ----------------- Write-Ahead Journal -----------------
+# Every append to a table or its tombstone log is first recorded, with the byte
+# offset it goes to, as one JSON line in "<file>.journal" and fsynced there; the
+# table is then written without an fsync of its own, so one small synced append
+# makes a write durable. After an unclean stop, recover() checks each journaled
+# write against the bytes at its offset and redoes the ones that were lost or torn.
+# A checkpoint fsyncs the table and log and removes the journal: once the journal
+# passes JOURNAL_CHECKPOINT_BYTES, after recovery, and before any full rewrite
+# (compaction, migration, a widened header), since a rewritten file no longer has
+# the journal's offsets. Rows are never updated in place, so inserts and deletes
+# are the only journaled operations.
+JOURNAL_CHECKPOINT_BYTES = 1 << 20
+
+
+def _journal_file(file):
+    return file + ".journal"
+
+
+def _fsync_path(path):
+    if os.path.isfile(path):
+        with open(path, "ab") as f:
+            os.fsync(f.fileno())
+
+
+def _redo(target, offset, data):
+    # True if the write had to be redone, False if it is already on disk, None if
+    # the file has changed behind the journal's back.
+    size = os.path.getsize(target) if os.path.isfile(target) else 0
+    if size < offset:
+        return None
+    existing = b""
+    if size:
+        with open(target, "rb") as f:
+            f.seek(offset)
+            existing = f.read(len(data))
+    if existing == data:
+        return False
+    if size > offset + len(data):
+        return None
+    # Lost or torn: everything from offset on belongs to this write.
+    with open(target, "r+b" if os.path.isfile(target) else "wb") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(data)
+    return True
+
+
+class CsvStorage:
+    name = "csv"
+
+    def __init__(self):
+        # Per-file tail state: file -> (stat key, header, next S.No, sorted S.No
+        # values scanned from the file, S.No values appended since). As long as the
+        # file on disk still matches the stat key, a new row is appended without
+        # re-parsing the table.
+        self._tails = {}
+        # Per-file tombstones: file -> (stat key of the log, frozenset of S.No).
+        self._deleted = {}
+
+    def _write_ahead(self, file, op, target, data):
+        # Called under the table lock: journal the append, then make it.
+        offset = os.path.getsize(target) if os.path.isfile(target) else 0
+        with open(_journal_file(file), "a", encoding="utf-8") as f:
+            f.write(json.dumps({"op": op, "offset": offset, "data": data}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            journaled = f.tell()
+        with open(target, "ab") as f:
+            f.write(data.encode("utf-8"))
+        if journaled >= JOURNAL_CHECKPOINT_BYTES:
+            self._checkpoint(file)
+
+    def _checkpoint(self, file):
+        journal = _journal_file(file)
+        if os.path.isfile(journal):
+            _fsync_path(file)
+            _fsync_path(_tombstone_file(file))
+            os.remove(journal)
+
+    def recover(self, file):
+        # Replays the journal left by an unclean stop and checkpoints; returns the
+        # number of writes redone. Replay stops at the first entry that does not
+        # match the file any more (a table replaced or edited by hand since).
+        journal = _journal_file(file)
+        redone = 0
+        with file_lock(file):
+            if not os.path.isfile(journal):
+                return 0
+            with open(journal, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last entry: its write never started
+                    target = file if entry["op"] == "insert" else _tombstone_file(file)
+                    done = _redo(target, entry["offset"], entry["data"].encode("utf-8"))
+                    if done is None:
+                        break
+                    redone += done
+            self._checkpoint(file)
+            self._tails.pop(file, None)
+            self._deleted.pop(file, None)
+        return redone
+
+    def version(self, file):
+        if not os.path.isfile(file):
+            return None
+        log = _tombstone_file(file)
+        return _stat_key(file), (_stat_key(log) if os.path.isfile(log) else None)
+
+    def create(self, file, columns):
+        if not os.path.exists(file):
+            with file_lock(file):
+                if not os.path.exists(file):
+                    atomic_write_csv(pd.DataFrame(columns=columns), file)
+
+    def tombstones(self, file):
+        log = _tombstone_file(file)
+        if not os.path.isfile(log):
+            return frozenset()
+        key = _stat_key(log)
+        cached = self._deleted.get(file)
+        if cached is None or cached[0] != key:
+            with open(log, encoding="utf-8") as f:
+                # A line without its newline is a torn write and is not a tombstone.
+                lines = f.read().split("\n")[:-1]
+            cached = (key, frozenset(int(line) for line in lines if line.strip()))
+            self._deleted[file] = cached
+        return cached[1]
+
+    def load(self, file, filters=None):
+        df = _read_typed(file, lambda: file)
+        deleted = self.tombstones(file)
+        if deleted:
+            df = df[~df["S.No"].isin(deleted)].reset_index(drop=True)
+        return _apply_filters(df, filters)
+
+    def iter_chunks(self, file, chunk_rows):
+        # Cells stay the stored text: per-chunk type inference would turn "007" into
+        # 7 and write a column as "3" in one chunk and "3.0" in another.
+        deleted = self.tombstones(file)
+        for chunk in _read_text(file, chunksize=chunk_rows):
+            yield chunk[~pd.to_numeric(chunk["S.No"], errors="coerce").isin(deleted)] if deleted else chunk
+
+    def _scan_tail(self, file):
+        header = pd.read_csv(file, nrows=0).columns.tolist()
+        next_s_no = 1
+        s_nos = np.empty(0, dtype="int64")
+        if "S.No" in header:
+            s_nos = pd.to_numeric(pd.read_csv(file, usecols=["S.No"])["S.No"], errors="coerce").dropna()
+            s_nos = np.unique(s_nos.astype("int64").to_numpy())
+            if len(s_nos):
+                next_s_no = int(s_nos[-1]) + 1
+        return header, next_s_no, s_nos, []
+
+    def _tail(self, file):
+        key = _stat_key(file)
+        cached = self._tails.get(file)
+        if cached is None or cached[0] != key:
+            cached = (key,) + self._scan_tail(file)
+            self._tails[file] = cached
+        return cached[1], cached[2]
+
+    def _in_file(self, file, s_no):
+        # Whether a row with this S.No is in the file, tombstoned or not.
+        self._tail(file)
+        _, _, _, scanned, appended = self._tails[file]
+        i = scanned.searchsorted(s_no)
+        return (i < len(scanned) and scanned[i] == s_no) or s_no in appended
+
+    def _next_s_no(self, file, next_in_file):
+        # Deleted ids stay allocated even after compaction removed their rows.
+        return max(next_in_file, max(self.tombstones(file), default=0) + 1)
+
+    def append(self, file, data):
+        # Returns the allocated S.No, the written row as a one-row frame that parses
+        # exactly like a re-read would (None when the layout changed), and the table
+        # version before and after the write, both taken under the table lock.
+        s_nos, rows, before, after = self.append_many(file, [data])
+        return s_nos[0], rows, before, after
+
+    def append_many(self, file, records):
+        # append for a batch: one lock, one S.No allocation, one write and fsync.
+        with file_lock(file):
+            before = self.version(file)
+            s_nos, rows = self._append_locked(file, records)
+            return s_nos, rows, before, self.version(file)
+
+    def _append_locked(self, file, records):
+        if not os.path.isfile(file) or os.path.getsize(file) == 0:
+            self._checkpoint(file)
+            s_nos = _number_rows(records, self._next_s_no(file, 1))
+            header = ["S.No"] + list(dict.fromkeys(c for data in records for c in data if c != "S.No"))
+            with open(file, "w", newline="", encoding="utf-8") as f:
+                f.write(_csv_line(header) + _csv_lines(header, records))
+                f.flush()
+                os.fsync(f.fileno())
+            self._tails[file] = (_stat_key(file), header, s_nos[-1] + 1, np.empty(0, dtype="int64"), list(s_nos))
+            return s_nos, None
+
+        header, next_s_no = self._tail(file)
+        s_nos = _number_rows(records, self._next_s_no(file, next_s_no))
+        if any(c not in header for data in records for c in data):
+            # Slow path for rows carrying columns the file does not have yet: the
+            # old read/concat/rewrite, which widens the header.
+            self._checkpoint(file)
+            df = _read_text(file)
+            df = pd.concat([df, pd.DataFrame(records)], ignore_index=True)
+            atomic_write_csv(df, file)
+            self._tails.pop(file, None)
+            return s_nos, None
+
+        lines = _csv_lines(header, records)
+        with open(file, "rb") as f:
+            prefix = "" if _ends_with_newline(f) else os.linesep
+        self._write_ahead(file, "insert", file, prefix + lines)
+        _, _, _, scanned, appended = self._tails[file]
+        appended.extend(s_nos)
+        self._tails[file] = (_stat_key(file), header, s_nos[-1] + 1, scanned, appended)
+        return s_nos, _read_typed(file, lambda: io.StringIO(_csv_line(header) + lines))
+
+    def delete(self, file, s_no):
+        # Returns the table version before and after, and whether the tombstone log
+        # has grown enough to be worth compacting.
+        s_no = int(s_no)
+        with file_lock(file):
+            before = self.version(file)
+            deleted = self.tombstones(file)
+            _, next_s_no = self._tail(file)
+            # Rows already deleted, compacted away or never written are all unknown.
+            if s_no in deleted or not self._in_file(file, s_no):
+                raise ValueError(f"No entry with S.No {s_no}")
+            log = _tombstone_file(file)
+            prefix = ""
+            if os.path.isfile(log):
+                with open(log, "rb") as f:
+                    prefix = "" if _ends_with_newline(f) else "\n"
+            self._write_ahead(file, "delete", log, f"{prefix}{s_no}\n")
+            pending = len(deleted) + 1
+            return before, self.version(file), (
+                pending >= COMPACT_MIN_TOMBSTONES and 4 * pending >= next_s_no
+            )
+
+    def compact(self, file):
+        # Returns the number of rows dropped and the version before and after.
+        with file_lock(file):
+            before = self.version(file)
+            deleted = self.tombstones(file)
+            if not deleted or not os.path.isfile(file):
+                return 0, before, before
+            self._checkpoint(file)
+            df = _read_text(file)
+            s_nos = pd.to_numeric(df["S.No"], errors="coerce")
+            keep = ~s_nos.isin(deleted)
+            atomic_write_csv(df[keep], file)
+            self._tails.pop(file, None)
+            # Keep the highest deleted id as a high-water mark so it is not handed
+            # out again once its row is gone from the file.
+            high = max(deleted)
+            log = _tombstone_file(file)
+            if keep.any() and high < s_nos[keep].max():
+                os.remove(log)
+            else:
+                fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(log)), suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(f"{high}\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                _match_mode(tmp, log)
+                os.replace(tmp, log)
+            return int((~keep).sum()), before, self.version(file)
+
+    def migrate(self, file):
+        # Rewrites the file into the canonical layout; returns whether it had to.
+        # Values are read and written back as the exact text that was on disk.
+        with file_lock(file):
+            if not os.path.isfile(file) or os.path.getsize(file) == 0:
+                return False
+            if not needs_migration(file, pd.read_csv(file, nrows=0).columns.tolist()):
+                return False
+            self._checkpoint(file)
+            df = _read_text(file)
+            atomic_write_csv(migrate_frame(df, file), file)
+            self._tails.pop(file, None)
+            return True
+
+
+# ----------------- SQLite Backend -----------------
+def _table_name(file):
+    return os.path.splitext(os.path.basename(file))[0]
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return None if isinstance(value, float) and value != value else value
+    if pd.isna(value):  # NaT, pd.NA
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class SqliteStorage:
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self):
+        # sqlite3 connections are bound to their thread and Streamlit serves every
+        # session from its own script thread, so each thread keeps one connection.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _mis_tables (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            # Tombstones, kept so a deleted S.No is never allocated again.
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _mis_deleted "
+                "(name TEXT NOT NULL, s_no INTEGER NOT NULL, PRIMARY KEY (name, s_no))"
+            )
+            self._local.conn = conn
+        return conn
+
+    def _columns(self, conn, table):
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    def _begin(self, conn, file):
+        # BEGIN IMMEDIATE takes SQLite's write lock up front; the time spent waiting
+        # for it is this backend's lock wait.
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        _record_lock_wait(file, time.perf_counter() - start)
+
+    def _bump(self, conn, table):
+        conn.execute(
+            "INSERT INTO _mis_tables (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (table,),
+        )
+
+    def version(self, file):
+        return self._version(self._connect(), _table_name(file))
+
+    def _version(self, conn, table):
+        row = conn.execute("SELECT version FROM _mis_tables WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else None
+
+    def _create(self, conn, table, columns):
+        # "S.No" is the rowid alias, so lookups and deletes by S.No are index seeks.
+        defs = ", ".join(
+            [f'{_quote("S.No")} INTEGER PRIMARY KEY'] + [_quote(c) for c in columns if c != "S.No"]
+        )
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({defs})")
+        self._bump(conn, table)
+
+    def create(self, file, columns):
+        conn = self._connect()
+        table = _table_name(file)
+        if not self._columns(conn, table):
+            self._create(conn, table, columns)
+
+    def _where(self, conn, table, filters):
+        # Equality on a value, or a (start, end) date range inclusive of both days.
+        # Dates are stored as ISO text with or without a time part, so the range is
+        # compared as text against the day after the end.
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            if column != "S.No":
+                self._index(conn, table, column)
+            if isinstance(value, tuple):
+                start, end = (pd.Timestamp(day) for day in value)
+                clauses.append(f"{_quote(column)} >= ? AND {_quote(column)} < ?")
+                params += [start.strftime("%Y-%m-%d"), (end + pd.Timedelta(days=1)).strftime("%Y-%m-%d")]
+            else:
+                clauses.append(f"{_quote(column)} = ?")
+                params.append(_sql_value(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def load(self, file, filters=None):
+        conn = self._connect()
+        table = _table_name(file)
+        where, params = self._where(conn, table, filters)
+        df = pd.read_sql_query(
+            f'SELECT * FROM {_quote(table)}{where} ORDER BY {_quote("S.No")}', conn, params=params
+        )
+        return apply_schema(df, file)
+
+    def _index(self, conn, table, column):
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote('ix_' + table + '_' + column)} "
+            f"ON {_quote(table)} ({_quote(column)})"
+        )
+
+    def iter_chunks(self, file, chunk_rows):
+        cursor = self._connect().execute(
+            f'SELECT * FROM {_quote(_table_name(file))} ORDER BY {_quote("S.No")}'
+        )
+        columns = [d[0] for d in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield pd.DataFrame(rows, columns=columns)
+
+    def load_columns(self, file, columns):
+        conn = self._connect()
+        table = _table_name(file)
+        present = [c for c in columns if c in self._columns(conn, table)]
+        if not present:
+            return pd.DataFrame(columns=columns)
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(_quote(c) for c in present)} FROM {_quote(table)} ORDER BY {_quote('S.No')}", conn
+        )
+        return apply_schema(df, file).reindex(columns=columns)
+
+    def count(self, file, filters=None):
+        conn = self._connect()
+        table = _table_name(file)
+        where, params = self._where(conn, table, filters)
+        return conn.execute(f"SELECT COUNT(*) FROM {_quote(table)}{where}", params).fetchone()[0]
+
+    def distinct(self, file, column):
+        conn = self._connect()
+        table = _table_name(file)
+        if column not in self._columns(conn, table):
+            return []
+        self._index(conn, table, column)
+        rows = conn.execute(
+            f"SELECT DISTINCT {_quote(column)} FROM {_quote(table)} "
+            f"WHERE {_quote(column)} IS NOT NULL AND {_quote(column)} != '' ORDER BY 1"
+        )
+        return [str(row[0]) for row in rows]
+
+    def load_page(self, file, offset, limit, sort_by=None, ascending=True, filters=None):
+        conn = self._connect()
+        table = _table_name(file)
+        where, params = self._where(conn, table, filters)
+        order = f'{_quote("S.No")} ASC'
+        if sort_by and sort_by in self._columns(conn, table):
+            if sort_by != "S.No":
+                self._index(conn, table, sort_by)
+            order = f"{_quote(sort_by)} {'ASC' if ascending else 'DESC'}, {order}"
+        df = pd.read_sql_query(
+            f"SELECT * FROM {_quote(table)}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+            conn,
+            params=params + [int(limit), int(offset)],
+        )
+        return apply_schema(df, file)
+
+    def append(self, file, data):
+        s_nos, rows, before, after = self.append_many(file, [data])
+        return s_nos[0], rows, before, after
+
+    def append_many(self, file, records):
+        conn = self._connect()
+        table = _table_name(file)
+        columns = ["S.No"] + list(dict.fromkeys(c for data in records for c in data if c != "S.No"))
+        self._begin(conn, file)
+        try:
+            before = self._version(conn, table)
+            existing = self._columns(conn, table)
+            if not existing:
+                self._create(conn, table, columns)
+                existing = self._columns(conn, table)
+            for column in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+            first = conn.execute(
+                f'SELECT MAX(COALESCE((SELECT MAX({_quote("S.No")}) FROM {_quote(table)}), 0), '
+                "COALESCE((SELECT MAX(s_no) FROM _mis_deleted WHERE name = ?), 0)) + 1",
+                (table,),
+            ).fetchone()[0]
+            s_nos = _number_rows(records, first)
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [[_sql_value(data.get(c)) for c in columns] for data in records],
+            )
+            self._bump(conn, table)
+            after = self._version(conn, table)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        rows = pd.read_sql_query(
+            f'SELECT * FROM {_quote(table)} WHERE {_quote("S.No")} BETWEEN ? AND ? ORDER BY {_quote("S.No")}',
+            conn,
+            params=[s_nos[0], s_nos[-1]],
+        )
+        return s_nos, rows, before, after
+
+    def delete(self, file, s_no):
+        conn = self._connect()
+        table = _table_name(file)
+        s_no = int(s_no)
+        self._begin(conn, file)
+        try:
+            before = self._version(conn, table)
+            cursor = conn.execute(f'DELETE FROM {_quote(table)} WHERE {_quote("S.No")} = ?', (s_no,))
+            if cursor.rowcount == 0:
+                # Like the CSV backend: a row already deleted is unknown too.
+                conn.execute("ROLLBACK")
+                raise ValueError(f"No entry with S.No {s_no}")
+            conn.execute("INSERT OR IGNORE INTO _mis_deleted (name, s_no) VALUES (?, ?)", (table, s_no))
+            self._bump(conn, table)
+            after = self._version(conn, table)
+            conn.execute("COMMIT")
+        except ValueError:
+            raise
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return before, after, False
+
+    def compact(self, file):
+        # Like the CSV backend, returns the number of table rows dropped. delete()
+        # already removed its rows, so this only catches a tombstoned row still in
+        # the table; after that only the highest tombstone matters.
+        conn = self._connect()
+        table = _table_name(file)
+        self._begin(conn, file)
+        try:
+            before = self._version(conn, table)
+            removed = 0
+            if self._columns(conn, table):
+                removed = conn.execute(
+                    f'DELETE FROM {_quote(table)} WHERE {_quote("S.No")} IN '
+                    "(SELECT s_no FROM _mis_deleted WHERE name = ?)",
+                    (table,),
+                ).rowcount
+                if removed:
+                    self._bump(conn, table)
+            conn.execute(
+                "DELETE FROM _mis_deleted WHERE name = ? "
+                "AND s_no < (SELECT MAX(s_no) FROM _mis_deleted WHERE name = ?)",
+                (table, table),
+            )
+            after = self._version(conn, table)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return removed, before, after
+
+    def migrate(self, file):
+        conn = self._connect()
+        table = _table_name(file)
+        self._begin(conn, file)
+        try:
+            if not needs_migration(file, self._columns(conn, table)):
+                conn.execute("ROLLBACK")
+                return False
+            df = migrate_frame(
+                pd.read_sql_query(f'SELECT * FROM {_quote(table)} ORDER BY {_quote("S.No")}', conn), file
+            )
+            # Dropping the table also drops its indexes; they come back on first use.
+            conn.execute(f"DROP TABLE {_quote(table)}")
+            self._create(conn, table, df.columns.tolist())
+            columns = df.columns.tolist()
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                ([_sql_value(v) for v in row] for row in df.itertuples(index=False, name=None)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def import_csv(self, file, replace=False):
+        # Copies the stored text, not the typed frame: load() would turn "June 2025"
+        # into a timestamp and free text in a number column into NULL.
+        source = CsvStorage()
+        df = _read_text(file)
+        deleted = source.tombstones(file)
+        s_nos = pd.to_numeric(df["S.No"], errors="coerce")
+        keep = s_nos.notna() & ~s_nos.isin(deleted)
+        df = df[keep].assign(**{"S.No": s_nos[keep].astype("int64")})
+        conn = self._connect()
+        table = _table_name(file)
+        self._begin(conn, file)
+        try:
+            if replace:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                conn.execute("DELETE FROM _mis_deleted WHERE name = ?", (table,))
+            elif self._columns(conn, table):
+                conn.execute("ROLLBACK")
+                return None
+            self._create(conn, table, df.columns.tolist())
+            columns = df.columns.tolist()
+            conn.executemany(
+                f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                ([_sql_value(v) for v in row] for row in df.itertuples(index=False, name=None)),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO _mis_deleted (name, s_no) VALUES (?, ?)",
+                ((table, s_no) for s_no in deleted),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(df)
+
+
+# ----------------- Storage Selection -----------------
+_STORAGE = None
+
+
+def get_storage():
+    global _STORAGE
+    if _STORAGE is None:
+        _STORAGE = SqliteStorage(SQLITE_PATH) if STORAGE_BACKEND == "sqlite" else CsvStorage()
+    return _STORAGE
+
+
+# ----------------- Write Hooks -----------------
+# Called after every write made through this module as
+# hook(event, file, before, after, payload), with the table versions around the write:
+#   "append"   payload is the new rows as a typed frame, or None when the write
+#              changed the table's layout
+#   "delete"   payload is the deleted row as a typed one-row frame; when the row
+#              was not at hand only its "S.No" column is filled in
+#   "compact"  visible rows are unchanged, only the version moved
+#   "rewrite"  the whole table was rewritten (before is None)
+# Hooks keep derived data (snapshots, aggregates) in step without re-reading tables.
+_WRITE_HOOKS = []
+
+
+def add_write_hook(hook):
+    if hook not in _WRITE_HOOKS:
+        _WRITE_HOOKS.append(hook)
+
+
+def _notify(event, file, before, after, payload=None):
+    for hook in _WRITE_HOOKS:
+        hook(event, file, before, after, payload)
+
+
+# ----------------- Table Cache -----------------
+# Process-wide parsed tables: file -> (version, DataFrame). Streamlit re-executes the
+# page script on every interaction, but imported modules stay loaded, so a rerun over
+# unchanged tables is served from here without touching pandas' parser. The version is
+# the file's stat key for CSV and a per-table write counter for SQLite.
+_TABLES = {}
+
+# Scraped through mis_metrics: latency per table and operation ("load" is a parse on
+# a cache miss), and how often read_table finds the table already cached.
+_STORAGE_SECONDS = histogram("mis_storage_seconds", "Latency of table loads, page reads and writes", ("table", "op"))
+_CACHE_HITS = counter("mis_table_cache_hits_total", "Table reads served from the process cache", ("table",))
+_CACHE_MISSES = counter("mis_table_cache_misses_total", "Table reads that had to load the table", ("table",))
+
+
+def _cache_hit_ratio():
+    hits, misses = _CACHE_HITS.totals(), _CACHE_MISSES.totals()
+    return {
+        key: hits.get(key, 0) / (hits.get(key, 0) + misses.get(key, 0))
+        for key in set(hits) | set(misses)
+    }
+
+
+def _row_counts():
+    # Tables this process has cached, plus SQLite's cached counts; a scrape never
+    # loads a table itself.
+    counts = {(file,): len(df) for file, (version, df) in list(_TABLES.items())}
+    counts.update({(file,): count for file, (version, count) in list(_ROW_COUNTS.items())})
+    return counts
+
+
+gauge("mis_table_cache_hit_ratio", "Share of table reads served from the process cache", ("table",), _cache_hit_ratio)
+gauge("mis_table_rows", "Rows per table, for the tables this process has read", ("table",), _row_counts)
+
+
+def create_table(file, columns):
+    get_storage().create(file, columns)
+
+
+def cached_table(file):
+    # The parsed table if it is already cached at the current version, else None.
+    cached = _TABLES.get(file)
+    if cached is not None and cached[0] == get_storage().version(file):
+        return cached[1]
+    return None
+
+
+def read_table(file, columns, filters=None):
+    storage = get_storage()
+    version = storage.version(file)
+    if version is None:
+        return pd.DataFrame(columns=columns)
+    if filters and storage.name == "sqlite":
+        return storage.load(file, filters)
+    cached = _TABLES.get(file)
+    if cached is None or cached[0] != version:
+        _CACHE_MISSES.inc(table=file)
+        with _STORAGE_SECONDS.time(table=file, op="load"):
+            df = storage.load(file)
+        if storage.version(file) != version:
+            # Written to while we were reading: the frame may already hold rows the
+            # writer is about to add to the cache itself, so leave it uncached.
+            return _apply_filters(df, filters)
+        cached = (version, df)
+        _TABLES[file] = cached
+    else:
+        _CACHE_HITS.inc(table=file)
+    return _apply_filters(cached[1], filters)
+
+
+def append_row(file, data):
+    with _STORAGE_SECONDS.time(table=file, op="append"):
+        s_no, row, before, after = get_storage().append(file, data)
+    if row is not None:
+        row = apply_schema(row, file)
+    _extend_cached(file, before, after, row)
+    _notify("append", file, before, after, row)
+    return s_no
+
+
+def append_rows(file, records):
+    # Appends a batch of rows in one write under one lock, with consecutive S.No
+    # values allocated once; returns them.
+    records = [dict(data) for data in records]
+    if not records:
+        return []
+    with _STORAGE_SECONDS.time(table=file, op="append"):
+        s_nos, rows, before, after = get_storage().append_many(file, records)
+    if rows is not None:
+        rows = apply_schema(rows, file)
+    _extend_cached(file, before, after, rows)
+    _notify("append", file, before, after, rows)
+    return s_nos
+
+
+def _lookup_row(file, s_no):
+    # Rows are never edited once written, so any cached copy of the row is exact.
+    cached = _TABLES.get(file)
+    if cached is not None:
+        row = cached[1][cached[1]["S.No"] == s_no]
+        if len(row):
+            return row.reset_index(drop=True)
+    storage = get_storage()
+    if storage.name == "sqlite" and storage.version(file) is not None:
+        return storage.load(file, {"S.No": s_no})
+    return pd.DataFrame({"S.No": [s_no]})
+
+
+def delete_row(file, s_no):
+    s_no = int(s_no)
+    row = _lookup_row(file, s_no) if _WRITE_HOOKS else None
+    with _STORAGE_SECONDS.time(table=file, op="delete"):
+        before, after, compact = get_storage().delete(file, s_no)
+    cached = _TABLES.get(file)
+    if cached is not None and cached[0] == before:
+        df = cached[1]
+        _TABLES[file] = (after, df[df["S.No"] != s_no].reset_index(drop=True))
+    else:
+        _TABLES.pop(file, None)
+    if after != before:
+        _notify("delete", file, before, after, row)
+    if compact:
+        _compact_in_background(file)
+
+
+def compact_table(file):
+    removed, before, after = get_storage().compact(file)
+    # Compaction only drops rows that reads already hide, so a cached frame of the
+    # pre-compaction table is still exact.
+    cached = _TABLES.get(file)
+    if cached is not None and cached[0] == before:
+        _TABLES[file] = (after, cached[1])
+    _notify("compact", file, before, after)
+    return removed
+
+
+_COMPACTING = set()
+_COMPACTING_GUARD = threading.Lock()
+
+
+def _compact_in_background(file):
+    with _COMPACTING_GUARD:
+        if file in _COMPACTING:
+            return
+        _COMPACTING.add(file)
+
+    def run():
+        try:
+            compact_table(file)
+        finally:
+            with _COMPACTING_GUARD:
+                _COMPACTING.discard(file)
+
+    threading.Thread(target=run, name=f"compact {file}", daemon=True).start()
+
+
+def _extend_cached(file, before, after, rows):
+    # Keep a cached table current after our own append instead of dropping it.
+    cached = _TABLES.get(file)
+    if rows is None or cached is None or cached[0] != before:
+        _TABLES.pop(file, None)
+        return
+    df = cached[1]
+    df = rows if df.empty else concat_rows(df, rows)
+    _TABLES[file] = (after, df)
+
+
+# ----------------- Recovery -----------------
+# Journals left behind by an unclean stop (see Write-Ahead Journal) are replayed
+# once per process, before any page reads a table. SQLite recovers from its own
+# write-ahead log when the database is opened.
+_RECOVER_LOCK = threading.Lock()
+_RECOVERY_SCANNED = False
+
+
+def recover_tables(files=None):
+    # Returns {file: writes redone} for the tables that needed any; without files,
+    # replays every "*.journal" here on the first call and does nothing after.
+    global _RECOVERY_SCANNED
+    storage = get_storage()
+    if storage.name != "csv":
+        return {}
+    redone = {}
+    with _RECOVER_LOCK:
+        if files is None:
+            if _RECOVERY_SCANNED:
+                return {}
+            _RECOVERY_SCANNED = True
+            files = sorted(path[:-len(".journal")] for path in glob.glob("*.journal"))
+        for file in files:
+            count = storage.recover(file)
+            if count:
+                _TABLES.pop(file, None)
+                _notify("rewrite", file, None, storage.version(file))
+                redone[file] = count
+    return redone
+
+
+# ----------------- Migrations -----------------
+# Tables written by an older layout (see mis_schema.LAYOUTS) are rewritten into the
+# canonical one once per process, before any page reads them, so reads and appends
+# always see the header the pages write and take the plain append path.
+_MIGRATED = set()
+_MIGRATE_LOCK = threading.Lock()
+
+
+def migrate_tables(files=None):
+    storage = get_storage()
+    migrated = []
+    with _MIGRATE_LOCK:
+        for file in files if files is not None else sorted(LAYOUTS):
+            if file in _MIGRATED:
+                continue
+            if storage.version(file) is not None and storage.migrate(file):
+                _TABLES.pop(file, None)
+                _notify("rewrite", file, None, storage.version(file))
+                migrated.append(file)
+            _MIGRATED.add(file)
+    return migrated
+
+
+# ----------------- Pagination -----------------
+# Record views only ever need one page of a table. SQLite answers that with an
+# indexed ORDER BY/LIMIT; for CSV the page is sliced out of the cached frame, with
+# the sort permutation cached per table version so paging through a sorted view
+# sorts once.
+_SORT_ORDERS = {}
+_ROW_COUNTS = {}
+
+
+def _ordered(column, ascending):
+    column = column.reset_index(drop=True)
+    try:
+        order = column.sort_values(ascending=ascending, kind="stable", na_position="last")
+    except TypeError:  # mixed types in a free-text column
+        order = column.astype(str).sort_values(ascending=ascending, kind="stable")
+    return order.index.to_numpy()
+
+
+def _sort_order(file, version, df, sort_by, ascending):
+    key = (file, sort_by, ascending)
+    cached = _SORT_ORDERS.get(key)
+    if cached is None or cached[0] != version:
+        cached = (version, _ordered(df[sort_by], ascending))
+        _SORT_ORDERS[key] = cached
+    return cached[1]
+
+
+# ----------------- Secondary Indexes -----------------
+# A filtered view (one course, one team member, a date range) looks its rows up in
+# per-column indexes over the cached CSV frame instead of comparing every row: a
+# value -> row positions map for labels, and the row positions sorted by date for
+# date columns, searched by bisection. Like the sort orders, each index is built
+# once per table version; the rows that match are the only ones sorted and sliced.
+# SQLite filters with a WHERE clause on an indexed column instead.
+_SECONDARY = {}
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+
+def _column_index(file, version, df, column):
+    key = (file, column)
+    cached = _SECONDARY.get(key)
+    if cached is None or cached[0] != version:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            order = np.flatnonzero(values.notna().to_numpy())
+            order = order[np.argsort(values.to_numpy()[order], kind="stable")]
+            index = (values.to_numpy()[order], order)
+        else:
+            groups = df.groupby(column, observed=True, sort=False).indices
+            index = {str(value): positions for value, positions in groups.items() if str(value) != ""}
+        cached = (version, index)
+        _SECONDARY[key] = cached
+    return cached[1]
+
+
+def _filter_positions(file, version, df, filters):
+    # Sorted positions of the rows matching every filter.
+    positions = None
+    for column, value in filters.items():
+        if column not in df.columns:
+            return _NO_ROWS
+        index = _column_index(file, version, df, column)
+        if isinstance(value, tuple):
+            if isinstance(index, dict):
+                raise ValueError(f"{column} does not hold dates")
+            days, order = index
+            start, end = (pd.Timestamp(day) for day in value)
+            first = days.searchsorted(start.to_datetime64(), "left")
+            last = days.searchsorted((end + pd.Timedelta(days=1)).to_datetime64(), "left")
+            match = np.sort(order[first:last])
+        else:
+            match = index.get(str(value), _NO_ROWS)
+        positions = match if positions is None else np.intersect1d(positions, match, assume_unique=True)
+    return positions
+
+
+def filter_values(file, column):
+    # The distinct values a filter on column can pick from.
+    storage = get_storage()
+    version = storage.version(file)
+    if version is None:
+        return []
+    if storage.name == "sqlite":
+        return storage.distinct(file, column)
+    df = read_table(file, [])
+    if column not in df.columns:
+        return []
+    index = _column_index(file, version, df, column)
+    return sorted(index) if isinstance(index, dict) else []
+
+
+def count_rows(file, columns, filters=None):
+    storage = get_storage()
+    version = storage.version(file)
+    if version is None:
+        return 0
+    if storage.name == "sqlite":
+        if filters:
+            return storage.count(file, filters)
+        cached = _ROW_COUNTS.get(file)
+        if cached is None or cached[0] != version:
+            cached = (version, storage.count(file))
+            _ROW_COUNTS[file] = cached
+        return cached[1]
+    df = read_table(file, columns)
+    if filters:
+        return len(_filter_positions(file, version, df, filters))
+    return len(df)
+
+
+def read_page(file, columns, page=1, page_size=50, sort_by=None, ascending=True, filters=None):
+    with _STORAGE_SECONDS.time(table=file, op="page"):
+        return _read_page(file, columns, page, page_size, sort_by, ascending, filters)
+
+
+def _read_page(file, columns, page, page_size, sort_by, ascending, filters):
+    storage = get_storage()
+    offset = max(page - 1, 0) * page_size
+    version = storage.version(file)
+    if version is None:
+        return pd.DataFrame(columns=columns)
+    if storage.name == "sqlite":
+        return storage.load_page(file, offset, page_size, sort_by, ascending, filters)
+    df = read_table(file, columns)
+    sort_by = sort_by if sort_by in df.columns else None
+    if filters:
+        rows = df.iloc[_filter_positions(file, version, df, filters)]
+        if sort_by and not (sort_by == "S.No" and ascending):
+            rows = rows.iloc[_ordered(rows[sort_by], ascending)]
+        return rows.iloc[offset:offset + page_size]
+    if not sort_by or (sort_by == "S.No" and ascending):
+        return df.iloc[offset:offset + page_size]
+    return df.iloc[_sort_order(file, version, df, sort_by, ascending)[offset:offset + page_size]]
+
+
+# ----------------- Export -----------------
+# Exports are built only when someone asks for one, streamed chunk by chunk into a
+# temp file so the table is never serialized as one big string, and kept per table
+# version so repeated downloads of an unchanged table reuse the same file.
+EXPORT_CHUNK_ROWS = 10000
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "mis_exports")
+EXPORT_MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+_EXPORTS = {}
+_EXPORT_LOCK = threading.Lock()
+
+
+def export_formats():
+    return ["csv", "xlsx"] if openpyxl is not None else ["csv"]
+
+
+def _write_csv_export(chunks, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(f, index=False, header=header)
+            header = False
+
+
+def _write_xlsx_export(chunks, path):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    header = True
+    for chunk in chunks:
+        if header:
+            sheet.append(chunk.columns.tolist())
+            header = False
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def open_export(file, fmt):
+    # Returns an open binary handle on the export; the caller closes it.
+    storage = get_storage()
+    with _EXPORT_LOCK:
+        version = storage.version(file)
+        cached = _EXPORTS.get((file, fmt))
+        if cached is None or cached[0] != version or not os.path.exists(cached[1]):
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=_table_name(file) + ".", suffix="." + fmt, dir=EXPORT_DIR)
+            os.close(fd)
+            writer = _write_xlsx_export if fmt == "xlsx" else _write_csv_export
+            writer(storage.iter_chunks(file, EXPORT_CHUNK_ROWS), path)
+            if cached is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(cached[1])
+            cached = (version, path)
+            _EXPORTS[(file, fmt)] = cached
+        return open(cached[1], "rb")
+
+
+# ----------------- CSV Import -----------------
+def import_csvs(db_path, files, replace=False):
+    storage = SqliteStorage(db_path)
+    return {file: storage.import_csv(file, replace=replace) for file in files}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Content MIS storage utilities")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="Copy the CSV tables into a SQLite database")
+    importer.add_argument("files", nargs="*", help="CSV tables to import (default: every *.csv here)")
+    importer.add_argument("--db", default=SQLITE_PATH)
+    importer.add_argument("--replace", action="store_true", help="Overwrite tables that already exist")
+    compactor = commands.add_parser("compact", help="Drop deleted rows from the stored tables")
+    compactor.add_argument("files", nargs="*", help="Tables to compact (default: every *.csv here)")
+    commands.add_parser("migrate", help="Rewrite tables in an older column layout into the current one")
+    recoverer = commands.add_parser("recover", help="Replay the write-ahead journals left by a crash")
+    recoverer.add_argument("files", nargs="*", help="Tables to recover (default: every table with a journal)")
+    args = parser.parse_args()
+
+    if args.command == "import":
+        for file, rows in import_csvs(args.db, args.files or sorted(glob.glob("*.csv")), args.replace).items():
+            print(f"{file}: skipped (table exists)" if rows is None else f"{file}: {rows} rows")
+    elif args.command == "compact":
+        for file in args.files or sorted(glob.glob("*.csv")):
+            print(f"{file}: {compact_table(file)} rows removed")
+    elif args.command == "migrate":
+        for file in migrate_tables():
+            print(f"{file}: migrated")
+    elif args.command == "recover":
+        redone = recover_tables(args.files or None)
+        for file, count in redone.items():
+            print(f"{file}: {count} writes redone")
+        if not redone:
+            print("Nothing to recover")